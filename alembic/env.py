@@ -7,7 +7,7 @@ from alembic import context
 
 from app.core.config import settings
 from app.core.database import Base
-from app.models import User  # Import all models here
+from app.models import User, AuditEvent, Company, CompanyDriver, Vehicle, Trip, TripSeat, Reservation  # Import all models here
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,26 @@
+"""Add phone verification columns to users
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("is_phone_verified", sa.Boolean(), nullable=False, server_default="false"))
+    op.add_column("users", sa.Column("phone_verified_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "phone_verified_at")
+    op.drop_column("users", "is_phone_verified")
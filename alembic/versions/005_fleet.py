@@ -0,0 +1,74 @@
+"""Add companies, company_drivers and vehicles tables
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "companies",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("registration_number", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("owner_id"),
+        sa.UniqueConstraint("registration_number"),
+    )
+    op.create_table(
+        "company_drivers",
+        sa.Column("company_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("driver_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("joined_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["company_id"], ["companies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["driver_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("company_id", "driver_id"),
+    )
+    op.create_index("ix_company_drivers_driver_id", "company_drivers", ["driver_id"], unique=True)
+    op.create_table(
+        "vehicles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("company_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("driver_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("plate_number", sa.String(), nullable=False),
+        sa.Column("make", sa.String(), nullable=True),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("seats", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default="true"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["company_id"], ["companies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["driver_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("plate_number"),
+    )
+    op.create_index("ix_vehicles_company_id_id", "vehicles", ["company_id", "id"], unique=False)
+    op.create_index(
+        "ix_vehicles_driver_id", "vehicles", ["driver_id"], unique=True,
+        postgresql_where=sa.text("driver_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicles_driver_id", table_name="vehicles")
+    op.drop_index("ix_vehicles_company_id_id", table_name="vehicles")
+    op.drop_table("vehicles")
+    op.drop_index("ix_company_drivers_driver_id", table_name="company_drivers")
+    op.drop_table("company_drivers")
+    op.drop_table("companies")
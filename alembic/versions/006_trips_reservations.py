@@ -0,0 +1,82 @@
+"""Add trips, reservations and trip_seats tables
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE TYPE reservationstatus AS ENUM ('held', 'confirmed', 'cancelled', 'expired')")
+
+    op.create_table(
+        "trips",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("company_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("vehicle_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("origin", sa.String(), nullable=False),
+        sa.Column("destination", sa.String(), nullable=False),
+        sa.Column("departure_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("price", sa.Integer(), nullable=False),
+        sa.Column("seats_total", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["company_id"], ["companies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_trips_company_id"), "trips", ["company_id"], unique=False)
+    op.create_index(op.f("ix_trips_vehicle_id"), "trips", ["vehicle_id"], unique=False)
+    op.create_index("ix_trips_route_departure", "trips", ["origin", "destination", "departure_at"], unique=False)
+
+    op.create_table(
+        "reservations",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("trip_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", postgresql.ENUM("held", "confirmed", "cancelled", "expired", name="reservationstatus", create_type=False), nullable=False),
+        sa.Column("seats", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("confirmed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["trip_id"], ["trips.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_reservations_trip_id"), "reservations", ["trip_id"], unique=False)
+    op.create_index(op.f("ix_reservations_user_id"), "reservations", ["user_id"], unique=False)
+
+    op.create_table(
+        "trip_seats",
+        sa.Column("trip_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("seat_number", sa.Integer(), nullable=False),
+        sa.Column("reservation_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("held_until", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["trip_id"], ["trips.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["reservation_id"], ["reservations.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("trip_id", "seat_number"),
+    )
+    op.create_index(op.f("ix_trip_seats_reservation_id"), "trip_seats", ["reservation_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_trip_seats_reservation_id"), table_name="trip_seats")
+    op.drop_table("trip_seats")
+    op.drop_index(op.f("ix_reservations_user_id"), table_name="reservations")
+    op.drop_index(op.f("ix_reservations_trip_id"), table_name="reservations")
+    op.drop_table("reservations")
+    op.drop_index("ix_trips_route_departure", table_name="trips")
+    op.drop_index(op.f("ix_trips_vehicle_id"), table_name="trips")
+    op.drop_index(op.f("ix_trips_company_id"), table_name="trips")
+    op.drop_table("trips")
+    op.execute("DROP TYPE IF EXISTS reservationstatus")
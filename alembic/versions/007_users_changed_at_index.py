@@ -0,0 +1,24 @@
+"""Index users by last change (coalesce(updated_at, created_at))
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from app.core.online_migrations import create_index_concurrently, drop_index_concurrently
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # users is large and live: build without blocking writes
+    create_index_concurrently("ix_users_changed_at", "users", ["(coalesce(updated_at, created_at))"])
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_users_changed_at")
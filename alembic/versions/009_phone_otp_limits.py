@@ -0,0 +1,31 @@
+"""Add phone_otp_limits table (OTP resend cooldown and attempt limit shared by all workers)
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "phone_otp_limits",
+        sa.Column("phone", sa.String(), nullable=False),
+        sa.Column("sent_at", sa.Float(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("window_start", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("phone"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("phone_otp_limits")
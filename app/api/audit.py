@@ -0,0 +1,33 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.audit import audit_log
+from app.core.database import get_db
+from app.api.deps import get_current_active_superuser
+from app.crud import audit as crud_audit
+from app.crud.user import UserRecord
+from app.schemas.audit import AuditEventPage
+
+router = APIRouter()
+
+
+@router.get("/events", response_model=AuditEventPage)
+def read_audit_events(
+    target_id: Optional[UUID] = None,
+    actor_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: UserRecord = Depends(get_current_active_superuser)
+):
+    """List audit events, newest first (superuser only). Use `next_before_id` to page."""
+    audit_log.flush()  # Include events still waiting in this worker's buffer
+    events = crud_audit.get_audit_events(
+        db, target_id=target_id, actor_id=actor_id, action=action, before_id=before_id, limit=limit
+    )
+    next_before_id = events[-1].id if len(events) == limit else None
+    return {"items": events, "next_before_id": next_before_id}
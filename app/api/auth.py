@@ -1,17 +1,54 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import EmailStr, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.config import settings
+from app.core.otp import OtpResult, send_otp, verify_otp
 from app.core.security import create_access_token
-from app.crud.user import authenticate_user, create_user, get_user_by_email, get_user_by_phone
+from app.core.sms import SmsSender, get_sms_sender
+from app.crud.user import (
+    authenticate_user,
+    create_user,
+    get_user_by_phone,
+    is_email_registered,
+    is_phone_registered,
+    mark_phone_verified,
+)
+from app.schemas.otp import OtpRequest, OtpSent, OtpVerify
 from app.schemas.token import Token
-from app.schemas.user import UserCreate, UserCreateDriver, User as UserSchema
+from app.schemas.user import Availability, UserCreate, UserCreateDriver, User as UserSchema
 
 router = APIRouter(tags=["auth"])
 
+# Normalizes emails the way registration stores them
+_email = TypeAdapter(EmailStr)
+
+
+@router.get("/availability", response_model=Availability)
+def check_availability(
+    phone: Optional[str] = Query(None, pattern=r"^\+225[0-9]{8}$"),
+    email: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Whether a phone number and/or email can still be registered (signup form checks)"""
+    if phone is None and email is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Give a phone and/or an email")
+    availability = Availability()
+    if phone is not None:
+        availability.phone_available = not is_phone_registered(db, phone)
+    if email is not None:
+        try:
+            email = _email.validate_python(email)
+        except ValidationError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid email")
+        availability.email_available = not is_email_registered(db, email)
+    return availability
+
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 def register(
@@ -19,8 +56,7 @@ def register(
     db: Session = Depends(get_db)
 ):
     """Register a new client (passenger) — most common flow"""
-    existing = get_user_by_phone(db, phone=user_in.phone)
-    if existing:
+    if is_phone_registered(db, user_in.phone):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Phone number already registered"
@@ -36,19 +72,16 @@ def register_driver(
     # Optionally: add Depends(get_current_active_superuser) if only admins can create drivers
 ):
     """Register a driver (individual or company)"""
-    existing = get_user_by_phone(db, phone=driver_in.phone)
-    if existing:
+    if is_phone_registered(db, driver_in.phone):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Phone number already registered"
         )
-    if driver_in.email:
-        existing = get_user_by_email(db, email=driver_in.email)
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
+    if driver_in.email and is_email_registered(db, driver_in.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     user = create_user(db, driver_in)  # CRUD will handle role
     return user
 
@@ -100,4 +133,65 @@ def login(
         "token_type": "bearer",
         "role": user.role.value,
         "user_id": str(user.id),
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/otp/request", response_model=OtpSent, status_code=status.HTTP_202_ACCEPTED)
+def request_phone_otp(
+    otp_in: OtpRequest,
+    db: Session = Depends(get_db),
+    sms: SmsSender = Depends(get_sms_sender),
+):
+    """Send a verification code by SMS to a registered, not yet verified phone number"""
+    user = get_user_by_phone(db, phone=otp_in.phone)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Phone number not registered",
+        )
+    if user.is_phone_verified:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Phone number already verified",
+        )
+    retry_after = send_otp(db, otp_in.phone, sms)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="A code was sent recently. Please wait before requesting another one.",
+            headers={"Retry-After": str(retry_after)},
+        )
+    return {"expires_in": settings.OTP_TTL_SECONDS, "resend_in": settings.OTP_RESEND_SECONDS}
+
+
+@router.post("/otp/verify")
+def verify_phone_otp(
+    otp_in: OtpVerify,
+    db: Session = Depends(get_db),
+):
+    """Verify the code sent by SMS and mark the phone number as verified"""
+    user = get_user_by_phone(db, phone=otp_in.phone)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Phone number not registered",
+        )
+    if user.is_phone_verified:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Phone number already verified",
+        )
+    result = verify_otp(db, otp_in.phone, otp_in.code)
+    if result == OtpResult.LOCKED:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many incorrect codes. Please request a new code later.",
+        )
+    if result == OtpResult.INVALID:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired code",
+        )
+    if not mark_phone_verified(db, phone=otp_in.phone):
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"phone": otp_in.phone, "is_phone_verified": True}
@@ -1,12 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.crud.user import get_user_by_phone
-from app.models.user import User
+from app.core.security import decode_access_token
+from app.crud.user import UserRecord, get_user_record_by_phone
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -14,29 +13,28 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> UserRecord:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        phone: str = payload.get("sub")
-        if phone is None:
-            raise credentials_exception
-    except JWTError:
+    payload = decode_access_token(token)
+    if payload is None:
+        raise credentials_exception
+    phone: str = payload.get("sub")
+    if phone is None:
         raise credentials_exception
 
-    user = get_user_by_phone(db, phone=phone)
+    user = get_user_record_by_phone(db, phone=phone)  # Columns only, no ORM instance
     if user is None:
         raise credentials_exception
     return user
 
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserRecord = Depends(get_current_user)
+) -> UserRecord:
     """Dependency to get the current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -44,8 +42,8 @@ def get_current_active_user(
 
 
 def get_current_active_superuser(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserRecord = Depends(get_current_user)
+) -> UserRecord:
     """Dependency to get an active superuser"""
     if not current_user.is_superuser:
         raise HTTPException(
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException
+
+from app.core import fares
+from app.schemas.fare import FareQuoteRequest, FareQuoteResponse, FareStops
+
+router = APIRouter()
+
+
+def _route_table() -> fares.RouteTable:
+    try:
+        return fares.get_route_table()
+    except (OSError, ValueError):
+        raise HTTPException(status_code=503, detail="Fare tables are not available")
+
+
+@router.get("/stops", response_model=FareStops)
+def read_stops():
+    """Stops that can be quoted"""
+    return {"stops": _route_table().stops}
+
+
+@router.post("/quote", response_model=FareQuoteResponse)
+def quote_fares(quote_in: FareQuoteRequest):
+    """Quote up to FARE_MAX_BATCH origin/destination pairs at once"""
+    _route_table()
+    pairs = [(pair.origin, pair.destination) for pair in quote_in.pairs]
+    quotes = fares.quote(pairs, quote_in.operator_role)
+    distances = quotes.distance_km.tolist()
+    prices = quotes.price.tolist()
+    return {
+        "operator_role": quote_in.operator_role,
+        "quotes": [
+            {
+                "origin": origin,
+                "destination": destination,
+                "distance_km": None if price < 0 else distance,
+                "price": None if price < 0 else price,
+            }
+            for (origin, destination), distance, price in zip(pairs, distances, prices)
+        ],
+    }
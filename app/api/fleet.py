@@ -0,0 +1,157 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.deps import get_current_active_user
+from app.crud import fleet as crud_fleet
+from app.crud import user as crud_user
+from app.crud.user import UserRecord
+from app.models.fleet import Company
+from app.models.user import UserRole
+from app.schemas.fleet import (
+    Company as CompanySchema,
+    CompanyCreate,
+    FleetDriverAdd,
+    FleetDriverPage,
+    FleetSummary,
+    Vehicle as VehicleSchema,
+    VehicleCreate,
+    VehiclePage,
+    VehicleUpdate,
+)
+
+router = APIRouter()
+
+
+def get_current_company(
+    current_user: UserRecord = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Company:
+    """Dependency to get the company managed by the current user"""
+    company = crud_fleet.get_company_by_owner(db, current_user.id)
+    if company is None:
+        raise HTTPException(status_code=404, detail="No company for this account")
+    return company
+
+
+def _check_fleet_driver(db: Session, company: Company, driver_id: UUID) -> None:
+    membership = crud_fleet.get_driver_membership(db, driver_id)
+    if membership is None or membership.company_id != company.id:
+        raise HTTPException(status_code=400, detail="Driver is not part of this fleet")
+
+
+@router.post("/company", response_model=CompanySchema, status_code=status.HTTP_201_CREATED)
+def create_company(
+    company_in: CompanyCreate,
+    current_user: UserRecord = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Create the company of a driver_company account"""
+    if current_user.role != UserRole.DRIVER_COMPANY:
+        raise HTTPException(status_code=403, detail="Only driver_company accounts can create a company")
+    if crud_fleet.get_company_by_owner(db, current_user.id) is not None:
+        raise HTTPException(status_code=400, detail="This account already has a company")
+    return crud_fleet.create_company(db, current_user.id, company_in)
+
+
+@router.get("/company", response_model=CompanySchema)
+def read_company(company: Company = Depends(get_current_company)):
+    """Get the current user's company"""
+    return company
+
+
+@router.get("/summary", response_model=FleetSummary)
+def read_fleet_summary(company: Company = Depends(get_current_company), db: Session = Depends(get_db)):
+    """Driver (active, KYC verified) and vehicle counts"""
+    return crud_fleet.get_fleet_summary(db, company.id)
+
+
+@router.get("/drivers", response_model=FleetDriverPage)
+def read_fleet_drivers(
+    after: Optional[UUID] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    is_active: Optional[bool] = None,
+    is_kyc_verified: Optional[bool] = None,
+    company: Company = Depends(get_current_company),
+    db: Session = Depends(get_db)
+):
+    """List the fleet's drivers with KYC/activity status and vehicle. Use `next_after` to page."""
+    drivers = crud_fleet.get_fleet_drivers(
+        db, company.id, after=after, limit=limit, is_active=is_active, is_kyc_verified=is_kyc_verified
+    )
+    next_after = drivers[-1].id if len(drivers) == limit else None
+    return {"items": drivers, "next_after": next_after}
+
+
+@router.post("/drivers", status_code=status.HTTP_204_NO_CONTENT)
+def add_fleet_driver(
+    driver_in: FleetDriverAdd,
+    company: Company = Depends(get_current_company),
+    db: Session = Depends(get_db)
+):
+    """Add a registered driver_individual to the fleet"""
+    driver = crud_user.get_user_by_phone(db, driver_in.phone)
+    if driver is None:
+        raise HTTPException(status_code=404, detail="Driver not found")
+    if driver.role != UserRole.DRIVER_INDIVIDUAL:
+        raise HTTPException(status_code=400, detail="User is not a driver")
+    if crud_fleet.get_driver_membership(db, driver.id) is not None:
+        raise HTTPException(status_code=409, detail="Driver already belongs to a company")
+    crud_fleet.add_driver(db, company.id, driver.id)
+    return None
+
+
+@router.delete("/drivers/{driver_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_fleet_driver(
+    driver_id: UUID,
+    company: Company = Depends(get_current_company),
+    db: Session = Depends(get_db)
+):
+    """Remove a driver from the fleet"""
+    if not crud_fleet.remove_driver(db, company.id, driver_id):
+        raise HTTPException(status_code=404, detail="Driver not found")
+    return None
+
+
+@router.get("/vehicles", response_model=VehiclePage)
+def read_vehicles(
+    after: Optional[UUID] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    company: Company = Depends(get_current_company),
+    db: Session = Depends(get_db)
+):
+    """List the fleet's vehicles. Use `next_after` to page."""
+    vehicles = crud_fleet.get_vehicles(db, company.id, after=after, limit=limit)
+    next_after = vehicles[-1].id if len(vehicles) == limit else None
+    return {"items": vehicles, "next_after": next_after}
+
+
+@router.post("/vehicles", response_model=VehicleSchema, status_code=status.HTTP_201_CREATED)
+def create_vehicle(
+    vehicle_in: VehicleCreate,
+    company: Company = Depends(get_current_company),
+    db: Session = Depends(get_db)
+):
+    """Register a vehicle, optionally assigned to one of the fleet's drivers"""
+    if vehicle_in.driver_id is not None:
+        _check_fleet_driver(db, company, vehicle_in.driver_id)
+    return crud_fleet.create_vehicle(db, company.id, vehicle_in)
+
+
+@router.patch("/vehicles/{vehicle_id}", response_model=VehicleSchema)
+def update_vehicle(
+    vehicle_id: UUID,
+    vehicle_update: VehicleUpdate,
+    company: Company = Depends(get_current_company),
+    db: Session = Depends(get_db)
+):
+    """Assign or unassign the driver, or (de)activate the vehicle"""
+    db_vehicle = crud_fleet.get_vehicle(db, company.id, vehicle_id)
+    if db_vehicle is None:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    if vehicle_update.driver_id is not None:
+        _check_fleet_driver(db, company, vehicle_update.driver_id)
+    return crud_fleet.update_vehicle(db, db_vehicle, vehicle_update)
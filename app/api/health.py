@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core import health
+
+router = APIRouter()
+
+
+@router.get("/health")
+@router.get("/health/live")
+async def liveness():
+    """The process is up and serving (no dependency checks; don't restart on DB outages)"""
+    return {"status": "healthy"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """503 while a dependency check fails or the worker is shutting down"""
+    ready, details = await health.readiness()
+    return JSONResponse(status_code=200 if ready else 503, content=details, headers={"Cache-Control": "no-store"})
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request, Response
+
+from app.core.config import settings
+from app.core.security import get_key_ring
+
+router = APIRouter()
+
+EMPTY_JWKS = b'{"keys":[]}'
+
+
+@router.get("/.well-known/jwks.json")
+def read_jwks(request: Request):
+    """Public keys for verifying access tokens locally (match the token's `kid`)"""
+    key_ring = get_key_ring()
+    body = key_ring.jwks_json if key_ring is not None else EMPTY_JWKS
+    headers = {"Cache-Control": f"public, max-age={settings.JWKS_MAX_AGE_SECONDS}"}
+    if key_ring is not None:
+        headers["ETag"] = key_ring.jwks_etag
+        if request.headers.get("if-none-match") == key_ring.jwks_etag:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
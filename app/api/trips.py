@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import AwareDatetime
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.api.deps import get_current_active_user
+from app.api.fleet import get_current_company
+from app.crud import fleet as crud_fleet
+from app.crud import trip as crud_trip
+from app.crud.user import UserRecord
+from app.models.fleet import Company
+from app.models.trip import Reservation, ReservationStatus
+from app.schemas.trip import (
+    Reservation as ReservationSchema,
+    ReservationCreate,
+    Trip as TripSchema,
+    TripCreate,
+    TripDetail,
+)
+
+router = APIRouter()
+reservations_router = APIRouter()
+
+
+def _reservation_out(db: Session, reservation: Reservation, seat_numbers: Optional[List[int]] = None) -> ReservationSchema:
+    if seat_numbers is None:
+        seat_numbers = crud_trip.get_reservation_seat_numbers(db, reservation.id)
+    return ReservationSchema.model_validate(reservation).model_copy(update={"seat_numbers": seat_numbers})
+
+
+def _get_own_reservation(db: Session, reservation_id: UUID, user: UserRecord) -> Reservation:
+    reservation = crud_trip.get_reservation(db, reservation_id)
+    if reservation is None or reservation.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    return reservation
+
+
+@router.post("/", response_model=TripSchema, status_code=status.HTTP_201_CREATED)
+def create_trip(
+    trip_in: TripCreate,
+    company: Company = Depends(get_current_company),
+    db: Session = Depends(get_db)
+):
+    """Schedule a departure with one of the company's vehicles (fleet managers)"""
+    vehicle = crud_fleet.get_vehicle(db, company.id, trip_in.vehicle_id)
+    if vehicle is None or not vehicle.is_active:
+        raise HTTPException(status_code=400, detail="Vehicle not found or inactive")
+    if trip_in.departure_at <= datetime.now(timezone.utc):
+        raise HTTPException(status_code=400, detail="Departure must be in the future")
+    db_trip = crud_trip.create_trip(db, company.id, trip_in, seats_total=vehicle.seats)
+    db_trip.seats_available = db_trip.seats_total  # Not a column: every seat of a new trip is free
+    return TripSchema.model_validate(db_trip)
+
+
+@router.get("/", response_model=List[TripSchema])
+def search_trips(
+    origin: str,
+    destination: str,
+    departure_from: Optional[AwareDatetime] = None,
+    departure_to: Optional[AwareDatetime] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """Upcoming departures on a route (next 7 days by default), with free seat counts"""
+    departure_from = departure_from or datetime.now(timezone.utc)
+    departure_to = departure_to or departure_from + timedelta(days=7)
+    return crud_trip.search_trips(db, origin, destination, departure_from, departure_to, limit=limit)
+
+
+@router.get("/{trip_id}", response_model=TripDetail)
+def read_trip(trip_id: UUID, db: Session = Depends(get_db)):
+    """Trip with the numbers of its free seats"""
+    trip = crud_trip.get_trip_with_availability(db, trip_id)
+    if trip is None:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    return {**trip._asdict(), "available_seat_numbers": crud_trip.get_available_seat_numbers(db, trip_id)}
+
+
+@router.post("/{trip_id}/reservations", response_model=ReservationSchema, status_code=status.HTTP_201_CREATED)
+def hold_seats(
+    trip_id: UUID,
+    reservation_in: ReservationCreate,
+    current_user: UserRecord = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Hold seats for SEAT_HOLD_SECONDS; confirm the reservation before `expires_at`"""
+    trip = crud_trip.get_trip(db, trip_id)
+    if trip is None:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    if trip.departure_at <= datetime.now(timezone.utc):
+        raise HTTPException(status_code=400, detail="Trip has already departed")
+    count = reservation_in.seats or len(reservation_in.seat_numbers)
+    if count > settings.RESERVATION_MAX_SEATS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.RESERVATION_MAX_SEATS} seats per reservation")
+    if reservation_in.seat_numbers and not all(1 <= n <= trip.seats_total for n in reservation_in.seat_numbers):
+        raise HTTPException(status_code=400, detail="Invalid seat number")
+
+    reservation, seat_numbers = crud_trip.hold_seats(
+        db, trip, current_user.id, seats=reservation_in.seats, seat_numbers=reservation_in.seat_numbers
+    )
+    if reservation is None:
+        raise HTTPException(status_code=409, detail="Not enough free seats")
+    return _reservation_out(db, reservation, seat_numbers)
+
+
+@reservations_router.get("/", response_model=List[ReservationSchema])
+def read_my_reservations(
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: UserRecord = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Current user's reservations, newest first"""
+    reservations = crud_trip.get_user_reservations(db, current_user.id, skip=skip, limit=limit)
+    seat_numbers = crud_trip.get_reservations_seat_numbers(db, [reservation.id for reservation in reservations])
+    return [_reservation_out(db, reservation, seat_numbers[reservation.id]) for reservation in reservations]
+
+
+@reservations_router.get("/{reservation_id}", response_model=ReservationSchema)
+def read_reservation(
+    reservation_id: UUID,
+    current_user: UserRecord = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get one of the current user's reservations"""
+    return _reservation_out(db, _get_own_reservation(db, reservation_id, current_user))
+
+
+@reservations_router.post("/{reservation_id}/confirm", response_model=ReservationSchema)
+def confirm_reservation(
+    reservation_id: UUID,
+    current_user: UserRecord = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Confirm held seats (409 if the hold has expired)"""
+    reservation = _get_own_reservation(db, reservation_id, current_user)
+    if reservation.current_status == ReservationStatus.CONFIRMED:
+        return _reservation_out(db, reservation)
+    if reservation.status != ReservationStatus.HELD or not crud_trip.confirm_reservation(db, reservation):
+        raise HTTPException(status_code=409, detail="Reservation has expired or was cancelled")
+    return _reservation_out(db, reservation)
+
+
+@reservations_router.delete("/{reservation_id}", response_model=ReservationSchema)
+def cancel_reservation(
+    reservation_id: UUID,
+    current_user: UserRecord = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Cancel a reservation and release its seats"""
+    reservation = _get_own_reservation(db, reservation_id, current_user)
+    if reservation.status in (ReservationStatus.CANCELLED, ReservationStatus.EXPIRED):
+        return _reservation_out(db, reservation)
+    trip = crud_trip.get_trip(db, reservation.trip_id)
+    if trip.departure_at <= datetime.now(timezone.utc):
+        raise HTTPException(status_code=400, detail="Trip has already departed")
+    reservation = crud_trip.release_reservation(db, reservation, ReservationStatus.CANCELLED)
+    return _reservation_out(db, reservation, [])
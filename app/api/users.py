@@ -1,71 +1,125 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.fieldsets import Fieldset
 from app.api.deps import get_current_active_user, get_current_active_superuser
 from app.crud import user as crud_user
-from app.models.user import User
-from app.schemas.user import User as UserSchema, UserUpdate
+from app.crud.user import UserRecord, user_fieldsets
+from app.schemas.user import User as UserSchema, UserAdminUpdate, UserBulkResult, UserBulkUpdate, UserUpdate
 
 router = APIRouter()
 
 
-@router.get("/me", response_model=UserSchema)
-def read_user_me(current_user: User = Depends(get_current_active_user)):
-    """Get current user information"""
-    return current_user
+def get_user_fieldset(
+    fields: Optional[str] = Query(
+        None,
+        description=f"Comma-separated fields to return (default all): {', '.join(user_fieldsets.allowed)}",
+    )
+) -> Fieldset:
+    """Dependency to parse ?fields= into the columns to select and the matching serializer"""
+    try:
+        return user_fieldsets.parse(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Responses are serialized straight to JSON bytes by the fieldset's precompiled serializer
+# (skips FastAPI's per-object response encoding), so these endpoints have no response_model:
+# `responses` documents the full shape, of which ?fields= returns a subset.
+def _json(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
+
+
+def _sparse_responses(model) -> dict:
+    return {200: {"model": model, "description": "The requested fields only, when `fields` is given"}}
+
+
+@router.get("/me", responses=_sparse_responses(UserSchema))
+def read_user_me(
+    fieldset: Fieldset = Depends(get_user_fieldset),
+    current_user: UserRecord = Depends(get_current_active_user)
+):
+    """Get current user information
+
+    Served from the record the token's user was already loaded into (all public columns), so
+    `fields` narrows the response, not a query.
+    """
+    return _json(fieldset.json(current_user))
 
 
 @router.put("/me", response_model=UserSchema)
 def update_user_me(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: UserRecord = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Update current user information"""
-    updated_user = crud_user.update_user(db, current_user.id, user_update)
+    updated_user = crud_user.update_user(db, current_user.id, user_update, actor_id=current_user.id)
     if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
     return updated_user
 
 
-@router.get("/", response_model=List[UserSchema])
+@router.get("/", responses=_sparse_responses(List[UserSchema]))
 def read_users(
     skip: int = 0,
     limit: int = 100,
+    fieldset: Fieldset = Depends(get_user_fieldset),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser)
+    current_user: UserRecord = Depends(get_current_active_superuser)
 ):
     """Get list of users (superuser only)"""
-    users = crud_user.get_users(db, skip=skip, limit=limit)
-    return users
+    users = crud_user.get_user_records(db, skip=skip, limit=limit, columns=fieldset.columns)
+    return _json(fieldset.json_many(users))
 
 
-@router.get("/{user_id}", response_model=UserSchema)
+@router.patch("/", response_model=UserBulkResult)
+def bulk_update_users(
+    bulk_update: UserBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: UserRecord = Depends(get_current_active_superuser)
+):
+    """Apply the same change (e.g. KYC approval, deactivation) to many users at once (superuser only)"""
+    try:
+        updated, not_found = crud_user.bulk_update_users(
+            db,
+            bulk_update.changes,
+            ids=bulk_update.ids,
+            user_filter=bulk_update.filter,
+            actor_id=current_user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return UserBulkResult(updated=updated, not_found=not_found)
+
+
+@router.get("/{user_id}", responses=_sparse_responses(UserSchema))
 def read_user(
     user_id: UUID,
+    fieldset: Fieldset = Depends(get_user_fieldset),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser)
+    current_user: UserRecord = Depends(get_current_active_superuser)
 ):
     """Get user by ID (superuser only)"""
-    db_user = crud_user.get_user(db, user_id=user_id)
+    db_user = crud_user.get_user_record(db, user_id=user_id, columns=fieldset.columns)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return db_user
+    return _json(fieldset.json(db_user))
 
 
 @router.put("/{user_id}", response_model=UserSchema)
 def update_user(
     user_id: UUID,
-    user_update: UserUpdate,
+    user_update: UserAdminUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser)
+    current_user: UserRecord = Depends(get_current_active_superuser)
 ):
-    """Update a user (superuser only)"""
-    db_user = crud_user.update_user(db, user_id, user_update)
+    """Update a user, including role and KYC status (superuser only)"""
+    db_user = crud_user.update_user(db, user_id, user_update, actor_id=current_user.id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
@@ -75,10 +129,10 @@ def update_user(
 def delete_user(
     user_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser)
+    current_user: UserRecord = Depends(get_current_active_superuser)
 ):
     """Delete a user (superuser only)"""
-    success = crud_user.delete_user(db, user_id)
+    success = crud_user.delete_user(db, user_id, actor_id=current_user.id)
     if not success:
         raise HTTPException(status_code=404, detail="User not found")
     return None
@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 
-from app.api import auth, users
+from app.api import audit, auth, fares, fleet, trips, users
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
-
+api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
+api_router.include_router(fleet.router, prefix="/fleet", tags=["fleet"])
+api_router.include_router(trips.router, prefix="/trips", tags=["trips"])
+api_router.include_router(trips.reservations_router, prefix="/reservations", tags=["trips"])
+api_router.include_router(fares.router, prefix="/fares", tags=["fares"])
@@ -0,0 +1,128 @@
+"""
+Buffered audit log.
+
+Request handlers call ``audit_log.record(...)`` after their change is committed; the event is
+appended to an in-memory buffer and a background thread writes buffered events to
+``audit_events`` in multi-row INSERTs, every AUDIT_FLUSH_INTERVAL_SECONDS or as soon as
+AUDIT_BATCH_SIZE events are waiting. Handlers therefore never wait on an audit round trip.
+
+Memory is bounded by AUDIT_MAX_BUFFER: when the buffer is full the recording thread flushes
+inline (back-pressure) rather than dropping events. The buffer is flushed on shutdown.
+"""
+import logging
+import threading
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.audit import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+class AuditLog:
+    """In-process buffer of audit events with a background batch writer."""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_buffer: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()           # Guards _buffer
+        self._flush_lock = threading.Lock()     # One flush at a time
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def record(
+        self,
+        action: str,
+        target_id: Optional[UUID] = None,
+        actor_id: Optional[UUID] = None,
+        changes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue an event. ``changes`` maps field -> (old, new)."""
+        event = {
+            "created_at": datetime.now(timezone.utc),
+            "actor_id": actor_id,
+            "target_id": target_id,
+            "action": action,
+            "changes": {k: [_jsonable(v) for v in pair] for k, pair in changes.items()} if changes else None,
+        }
+        with self._lock:
+            self._buffer.append(event)
+            pending = len(self._buffer)
+        if pending >= self.max_buffer:
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of events written."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+            if not events:
+                return 0
+            try:
+                with engine.begin() as conn:
+                    for start in range(0, len(events), self.batch_size):
+                        conn.execute(insert(AuditEvent).values(events[start:start + self.batch_size]))
+            except SQLAlchemyError:
+                logger.exception("Failed to write %d audit events, will retry", len(events))
+                with self._lock:
+                    self._buffer[:0] = events
+                    overflow = len(self._buffer) - self.max_buffer
+                    if overflow > 0:
+                        del self._buffer[:overflow]
+                        self.dropped += overflow
+                        logger.error("Audit buffer full, dropped %d oldest events", overflow)
+                return 0
+            return len(events)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        """Start the background writer (call in each worker, after fork)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer and flush what is left."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+
+audit_log = AuditLog(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_buffer=settings.AUDIT_MAX_BUFFER,
+)
@@ -0,0 +1,234 @@
+"""
+Phone/email availability filter.
+
+A Bloom filter of every registered phone number and email, so that availability checks (the
+signup form, registration) for values nobody has registered, which is nearly all of them, are
+answered without a query. "Not in the filter" is definite. "In the filter" means "maybe" and
+is confirmed against the database; about AVAILABILITY_FALSE_POSITIVE_RATE of unregistered
+values get that extra query.
+
+Each process holds its own filter. It is built with one streaming scan of ``users``, in the
+gunicorn master before forking or in the background at worker startup. Until it is built,
+every check goes to the database. The process's own registrations and email changes are
+added as they happen. Every AVAILABILITY_REFRESH_SECONDS, users created or changed since the
+last scan (by other workers, scripts, ...) are added too. A Bloom filter can't forget:
+deleted phones and emails stay "maybe" and cost a query until the next full build. The unique
+constraints on ``users`` stay the final check, so a registration that races a stale filter
+fails with "already registered" at insert.
+
+Counters in ``app.core.metrics``: ``availability.checks``, ``.db_skipped``,
+``.false_positives``, ``.builds`` and ``.stale_keys`` (deleted values still in the filter).
+"""
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import engine
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Bit array with ``hashes`` positions per key (double hashing of one 128-bit blake2b digest)."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = max(1, capacity)
+        self.size = max(64, math.ceil(-self.capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0  # Distinct keys added (approximately: false positives are not counted)
+
+    def _positions(self, key: bytes) -> List[int]:
+        digest = blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [((h1 + i * h2) & _MASK64) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key: bytes) -> None:
+        if key in self:
+            return
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def add_many(self, keys: Sequence[bytes]) -> None:
+        """Add distinct keys not in the filter yet, in one NumPy pass (same positions as ``add``)."""
+        if not keys:
+            return
+        digests = np.frombuffer(
+            b"".join(blake2b(key, digest_size=16).digest() for key in keys), dtype="<u8"
+        ).reshape(-1, 2)
+        h1, h2 = digests[:, :1], digests[:, 1:] | np.uint64(1)
+        positions = ((h1 + np.arange(self.hashes, dtype=np.uint64) * h2) % np.uint64(self.size)).ravel()
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        np.bitwise_or.at(np.frombuffer(self.bits, dtype=np.uint8), positions >> np.uint64(3), masks)
+        self.count += len(keys)
+
+
+def phone_key(phone: str) -> bytes:
+    return b"p:" + phone.encode()
+
+
+def email_key(email: str) -> bytes:
+    return b"e:" + email.encode()
+
+
+def _keys(rows: Iterable) -> List[bytes]:
+    """Filter keys of (phone, email) rows."""
+    keys = []
+    for phone, email in rows:
+        keys.append(phone_key(phone))
+        if email is not None:
+            keys.append(email_key(email))
+    return keys
+
+
+# When a user was created or last changed (indexed: ix_users_changed_at)
+USER_CHANGED_AT = func.coalesce(User.updated_at, User.created_at)
+
+
+class UserAvailability:
+    """The Bloom filter of registered phones and emails, with its build and refresh."""
+
+    def __init__(
+        self,
+        false_positive_rate: float,
+        headroom: float,
+        min_capacity: int,
+        refresh_interval: float,
+        refresh_overlap: float,
+        scan_batch_size: int,
+    ):
+        self.false_positive_rate = false_positive_rate
+        self.headroom = headroom
+        self.min_capacity = min_capacity
+        self.refresh_interval = refresh_interval
+        self.refresh_overlap = timedelta(seconds=refresh_overlap)
+        self.scan_batch_size = scan_batch_size
+        self.filter: Optional[BloomFilter] = None
+        self._scanned_at: Optional[datetime] = None  # DB time the last scan started
+        self._lock = threading.Lock()               # Guards writes to the filter
+        self._scan_lock = threading.Lock()          # One build/refresh at a time
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _might_contain(self, key: bytes) -> bool:
+        bloom = self.filter
+        return bloom is None or key in bloom
+
+    def might_have_phone(self, phone: str) -> bool:
+        """False only if no user has this phone (True while the filter is not built)."""
+        return self._might_contain(phone_key(phone))
+
+    def might_have_email(self, email: str) -> bool:
+        """False only if no user has this email (True while the filter is not built)."""
+        return self._might_contain(email_key(email))
+
+    def add(self, phone: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Record a phone and/or email that was just registered by this process."""
+        bloom = self.filter
+        if bloom is None:
+            return  # The build in progress (or the next refresh) will see it
+        with self._lock:
+            if phone is not None:
+                bloom.add(phone_key(phone))
+            if email is not None:
+                bloom.add(email_key(email))
+
+    def discard(self, phone: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Note deleted values: they stay in the filter (answered by the DB) until the next build."""
+        metrics.inc("availability.stale_keys", (phone is not None) + (email is not None))
+
+    def build(self) -> None:
+        """Build a new filter from one streaming scan of users and swap it in."""
+        with self._scan_lock:
+            started = time.monotonic()
+            with engine.connect() as conn:
+                scanned_at = conn.scalar(select(func.now()))
+                users, emails = conn.execute(select(func.count(), func.count(User.email))).one()
+                bloom = BloomFilter(
+                    max(self.min_capacity, int((users + emails) * self.headroom)), self.false_positive_rate
+                )
+                result = conn.execution_options(yield_per=self.scan_batch_size).execute(
+                    select(User.phone, User.email)
+                )
+                for rows in result.partitions():
+                    if self._stopping.is_set():
+                        return  # Shutting down mid-build
+                    bloom.add_many(_keys(rows))
+            with self._lock:
+                self.filter = bloom
+                self._scanned_at = scanned_at
+            metrics.inc("availability.builds")
+            logger.info(
+                "Availability filter built: %d phones/emails, %.1f MB, %.1fs",
+                bloom.count, len(bloom.bits) / 1e6, time.monotonic() - started,
+            )
+
+    def refresh(self) -> None:
+        """Add users created or changed since the last scan; rebuild when the filter is full."""
+        bloom = self.filter
+        if bloom is None or bloom.count > bloom.capacity:
+            self.build()
+            return
+        with self._scan_lock:
+            with engine.connect() as conn:
+                scanned_at = conn.scalar(select(func.now()))
+                rows = conn.execute(
+                    select(User.phone, User.email).where(USER_CHANGED_AT >= self._scanned_at - self.refresh_overlap)
+                ).all()
+            with self._lock:
+                # The overlap re-reads recent users; only count values that are new to the filter
+                bloom.add_many([key for key in _keys(rows) if key not in bloom])
+                self._scanned_at = scanned_at
+
+    def _run(self) -> None:
+        interval = 0.0 if self.filter is None else self.refresh_interval
+        while not self._stopping.wait(interval):
+            try:
+                self.refresh()
+            except SQLAlchemyError:
+                logger.exception("Failed to refresh the availability filter, will retry")
+            interval = self.refresh_interval
+
+    def start(self) -> None:
+        """Start the background build/refresh (call in each worker, after fork)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="availability-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+user_availability = UserAvailability(
+    false_positive_rate=settings.AVAILABILITY_FALSE_POSITIVE_RATE,
+    headroom=settings.AVAILABILITY_HEADROOM,
+    min_capacity=settings.AVAILABILITY_MIN_CAPACITY,
+    refresh_interval=settings.AVAILABILITY_REFRESH_SECONDS,
+    refresh_overlap=settings.AVAILABILITY_REFRESH_OVERLAP_SECONDS,
+    scan_batch_size=settings.AVAILABILITY_SCAN_BATCH_SIZE,
+)
@@ -0,0 +1,157 @@
+"""
+Response compression (brotli or gzip, negotiated from Accept-Encoding).
+
+Bodies smaller than COMPRESSION_MIN_SIZE are sent as is. Streaming responses are compressed
+chunk by chunk and flushed after each one, so clients still receive data incrementally.
+Responses marked ``Cache-Control: no-transform`` are never compressed. Every other response of a
+compressible type gets ``Vary: Accept-Encoding``, compressed or not, so shared caches keep the
+variants apart.
+
+Per-encoding counters are kept in ``app.core.metrics``:
+``compression.<enc>.responses``, ``.bytes_in``, ``.bytes_out`` and ``.cpu_seconds``.
+"""
+import time
+import zlib
+from typing import Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding we support from an Accept-Encoding header, preferring br over gzip on ties."""
+    supported = ("br", "gzip")
+    best, best_q = None, 0.0
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        candidates = supported if name == "*" else ((name,) if name in supported else ())
+        for candidate in candidates:
+            if q > best_q or (q == best_q and q > 0 and supported.index(candidate) < supported.index(best)):
+                best, best_q = candidate, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor that also tracks sizes and CPU time."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        started = time.thread_time()
+        if self.encoding == "br":
+            out = self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        else:
+            out = self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+        self.cpu_seconds += time.thread_time() - started
+        self.bytes_in += len(data)
+        self.bytes_out += len(out)
+        return out
+
+    def report(self) -> None:
+        prefix = f"compression.{self.encoding}"
+        metrics.inc(f"{prefix}.responses")
+        metrics.inc(f"{prefix}.bytes_in", self.bytes_in)
+        metrics.inc(f"{prefix}.bytes_out", self.bytes_out)
+        metrics.inc(f"{prefix}.cpu_seconds", self.cpu_seconds)
+
+
+def _negotiable(headers: Headers) -> bool:
+    """Whether the response may be compressed, i.e. its encoding depends on Accept-Encoding."""
+    return (
+        "content-encoding" not in headers
+        and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        and "no-transform" not in headers.get("cache-control", "").lower()
+    )
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing large enough, compressible responses."""
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                headers = MutableHeaders(scope=message)
+                if not _negotiable(headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message  # Held until we know the body size
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["Content-Encoding"] = encoding
+                compressed = compressor.compress(body, final=not more_body)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(compressed))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            else:
+                compressed = compressor.compress(body, final=not more_body)
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            if not more_body:
+                compressor.report()
+
+        await self.app(scope, receive, compressing_send)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import field_validator
+from pydantic import AwareDatetime, field_validator
+from typing import Dict, Optional
 import os
 
 
@@ -12,14 +13,91 @@ class Settings(BaseSettings):
 
     # Security
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"                       # "ES256" signs with JWT_KEYS_DIR keys (see README)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_KEYS_DIR: Optional[str] = None             # <kid>.pem files: private keys sign+verify, public keys verify only
+    JWT_ACTIVE_KID: Optional[str] = None           # Key used to sign new tokens
+    JWKS_MAX_AGE_SECONDS: int = 3600               # Cache-Control max-age of the JWKS endpoint
+    JWT_LEGACY_HS256_UNTIL: Optional[AwareDatetime] = None  # With ES256: accept kid-less SECRET_KEY tokens until then
+
+    # Password hashing (pick costs with scripts/calibrate_password_hash.py; hashes made with
+    # another scheme or cost are upgraded at the user's next successful login)
+    PASSWORD_HASH_SCHEME: str = "bcrypt"           # "bcrypt" or "argon2" (argon2id, needs argon2-cffi)
+    PASSWORD_BCRYPT_ROUNDS: int = 12               # log2 of the bcrypt work factor
+    PASSWORD_ARGON2_TIME_COST: int = 3             # Passes over memory
+    PASSWORD_ARGON2_MEMORY_KIB: int = 64 * 1024
+    PASSWORD_ARGON2_PARALLELISM: int = 2
+
+    # Server (gunicorn.conf.py)
+    WEB_CONCURRENCY: Optional[int] = None          # Defaults to the CPUs available to the container
+    MAX_REQUESTS: int = 10000                      # Recycle a worker after this many requests (0 disables)
+    MAX_REQUESTS_JITTER: int = 1000                # Spread recycling so workers don't restart together
+    GRACEFUL_TIMEOUT: int = 30                     # Seconds a worker gets to finish in-flight requests
+    KEEPALIVE: int = 5
+    SHUTDOWN_DELAY_SECONDS: float = 5.0            # After SIGTERM, keep serving while reporting not ready
+    READINESS_CACHE_SECONDS: float = 2.0           # Reuse a readiness result for this long
+    READINESS_CHECK_TIMEOUT: float = 2.0           # Readiness fails if its checks take longer
+
+    # Idempotency-Key replay store (idempotency_keys table, shared by all workers)
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 64 * 1024     # Larger responses are not stored
+    IDEMPOTENCY_WAIT_SECONDS: int = 30              # How long a retry waits on the in-flight original
+    IDEMPOTENCY_LEASE_SECONDS: int = 120            # A claim older than this (worker died) is taken over
+    IDEMPOTENCY_PURGE_SECONDS: float = 300.0        # How often each worker deletes expired keys
+
+    # Phone verification (OTP)
+    SMS_BACKEND: Optional[str] = None               # Required: "package.module:SenderClass", or "stub" (logs codes) for local runs
+    OTP_LENGTH: int = 6
+    OTP_TTL_SECONDS: int = 300
+    OTP_RESEND_SECONDS: int = 60
+    OTP_MAX_ATTEMPTS: int = 5                       # Codes a phone may try per attempt window (all workers)
+    OTP_ATTEMPT_WINDOW_SECONDS: int = 3600
+    OTP_MAX_ENTRIES: int = 1_000_000                # Blocked phones each worker remembers (saves queries)
+
+    # Phone/email availability filter (per process Bloom filter of registered users)
+    AVAILABILITY_FALSE_POSITIVE_RATE: float = 0.01  # Share of unregistered values that still need a query
+    AVAILABILITY_HEADROOM: float = 1.5              # Capacity = values at build time x this (rebuilt when full)
+    AVAILABILITY_MIN_CAPACITY: int = 100_000
+    AVAILABILITY_REFRESH_SECONDS: float = 10.0      # Pick up users created or changed by other processes
+    AVAILABILITY_REFRESH_OVERLAP_SECONDS: float = 60.0  # Re-read this far back (transactions commit out of order)
+    AVAILABILITY_SCAN_BATCH_SIZE: int = 50_000      # Rows per fetch of the streaming build scan
+
+    # Audit log (buffered, written in batches)
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_MAX_BUFFER: int = 10000
+
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = 1024                # Smaller bodies are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6                 # 1 (fast) .. 9 (small)
+    COMPRESSION_BROTLI_QUALITY: int = 4             # 0 (fast) .. 11 (small)
+    METRICS_TOKEN: Optional[str] = None             # GET /metrics needs "Authorization: Bearer <token>"; unset disables it
+
+    # Seat reservations
+    SEAT_HOLD_SECONDS: int = 10 * 60                # Held seats are released if not confirmed in time
+    RESERVATION_MAX_SEATS: int = 10                 # Seats per reservation
+
+    # Fare quotes (route table built with scripts/build_route_table.py)
+    ROUTE_TABLE_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "route_table")
+    FARE_PRICING: Dict[str, Dict[str, float]] = {   # Per operator role, in XOF: base + per_km * km, at least minimum
+        "driver_company": {"base": 1000, "per_km": 22, "minimum": 2000},
+        "driver_individual": {"base": 500, "per_km": 28, "minimum": 1500},
+    }
+    FARE_ROUNDING: int = 50                         # Prices are rounded to a multiple of this
+    FARE_MAX_BATCH: int = 1000                      # Origin/destination pairs per quote request
 
     @field_validator("SECRET_KEY", mode="after")
     @classmethod
     def strip_secret_key(cls, v: str) -> str:
         return (v or "").strip()
 
+    @field_validator("PASSWORD_HASH_SCHEME", mode="after")
+    @classmethod
+    def check_password_hash_scheme(cls, v: str) -> str:
+        if v not in ("bcrypt", "argon2"):
+            raise ValueError("PASSWORD_HASH_SCHEME must be bcrypt or argon2")
+        return v
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".env"),
         case_sensitive=True,
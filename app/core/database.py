@@ -18,3 +18,11 @@ def get_db():
     finally:
         db.close()
 
+
+
+def dispose_engine_after_fork() -> None:
+    """Forget pooled connections inherited from the parent process (call in each forked worker).
+
+    ``close=False`` leaves the parent's sockets alone; the child simply starts with an empty pool.
+    """
+    engine.dispose(close=False)
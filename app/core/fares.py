@@ -0,0 +1,82 @@
+"""
+Batched fare quotes.
+
+Distances between stops come from a precomputed route table (``ROUTE_TABLE_DIR``, built by
+``scripts/build_route_table.py``): ``stops.json`` plus an N x N float32 matrix in
+``distances.npy``. The matrix is memory-mapped, so it is read lazily, and gunicorn workers
+share it through the page cache instead of each holding a copy.
+
+A batch of origin/destination pairs is priced in one NumPy pass:
+price = max(minimum, base + per_km * km), rounded to FARE_ROUNDING, with base, per_km and
+minimum taken from FARE_PRICING for the operator's role (company or individual drivers).
+Quotes are not cached: the pass costs little more than a lookup of each pair would.
+"""
+import json
+import os
+from functools import lru_cache
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.user import UserRole
+
+# Roles that operate trips, and so have a fare schedule
+OPERATOR_ROLES = (UserRole.DRIVER_COMPANY, UserRole.DRIVER_INDIVIDUAL)
+
+
+def normalize_stop(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class RouteTable:
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, "stops.json"), encoding="utf-8") as f:
+            self.stops: List[str] = json.load(f)
+        self.index = {normalize_stop(name): i for i, name in enumerate(self.stops)}
+        self.index.update((name, i) for i, name in enumerate(self.stops))  # Exact names skip normalizing
+        self.distances = np.load(os.path.join(directory, "distances.npy"), mmap_mode="r")
+        if self.distances.shape != (len(self.stops), len(self.stops)):
+            raise ValueError(f"Route table in {directory}: distances do not match stops.json")
+
+    def indices(self, names: Sequence[str]) -> np.ndarray:
+        """Matrix index of each stop name, -1 for unknown stops."""
+        index = self.index
+        return np.fromiter(
+            (index[name] if name in index else index.get(normalize_stop(name), -1) for name in names),
+            dtype=np.int32,
+            count=len(names),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_route_table() -> RouteTable:
+    """The route table of this process (loaded once; raises OSError if it was not built)."""
+    return RouteTable(settings.ROUTE_TABLE_DIR)
+
+
+class FareQuotes(NamedTuple):
+    distance_km: np.ndarray     # km to 0.1, NaN where the pair can't be quoted
+    price: np.ndarray           # int64 XOF, -1 where the pair can't be quoted
+
+
+def price_for_distance(role: UserRole, distance_km: np.ndarray) -> np.ndarray:
+    pricing = settings.FARE_PRICING[role.value]
+    raw = np.maximum(pricing["minimum"], pricing["base"] + pricing["per_km"] * distance_km)
+    return (np.round(raw / settings.FARE_ROUNDING) * settings.FARE_ROUNDING).astype(np.int64)
+
+
+def quote(pairs: Sequence[Tuple[str, str]], role: UserRole) -> FareQuotes:
+    """Distances and prices for (origin, destination) stop names, in order."""
+    metrics.inc("fares.quotes", len(pairs))
+    table = get_route_table()
+    origin = table.indices([origin for origin, _ in pairs])
+    destination = table.indices([destination for _, destination in pairs])
+    known = (origin >= 0) & (destination >= 0) & (origin != destination)
+
+    distance = np.full(len(pairs), np.nan)
+    distance[known] = table.distances[origin[known], destination[known]]
+    price = np.full(len(pairs), -1, dtype=np.int64)
+    price[known] = price_for_distance(role, distance[known])
+    return FareQuotes(distance.round(1), price)
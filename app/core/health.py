@@ -0,0 +1,117 @@
+"""
+Liveness/readiness state and graceful draining.
+
+Readiness runs the registered dependency checks (DB by default) in the threadpool, with a
+timeout, and caches the result for READINESS_CACHE_SECONDS so probes from many nodes cost at
+most one check per worker per interval. Concurrent probes share one in-flight check. A probe
+that times out reports not ready but leaves the check running, and later probes wait on that
+same check rather than piling up more blocked threads (e.g. on a hung DB).
+
+Draining: ``install_drain_handler`` (called at startup) intercepts SIGTERM. The worker then
+reports not ready but keeps serving for SHUTDOWN_DELAY_SECONDS, so load balancers stop routing
+to it first, before handing over to the server's own graceful shutdown: uvicorn stops
+accepting connections and waits for in-flight requests before the app's shutdown runs.
+"""
+import asyncio
+import logging
+import os
+import signal
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# name -> function returning details (raise to report the dependency as down)
+_checks: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_cached: Optional[Tuple[float, bool, Dict[str, Any]]] = None
+_check_run: Optional["asyncio.Future[Tuple[bool, Dict[str, Any]]]"] = None  # In-flight checks
+
+draining = False
+
+
+def register_check(name: str, check: Callable[[], Dict[str, Any]]) -> None:
+    """Add a readiness check; it runs in the threadpool and fails by raising."""
+    _checks[name] = check
+
+
+def check_database() -> Dict[str, Any]:
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return {
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "pool": engine.pool.status(),
+    }
+
+
+register_check("database", check_database)
+
+
+def _run_checks() -> Tuple[bool, Dict[str, Any]]:
+    ok = True
+    results: Dict[str, Any] = {}
+    for name, check in _checks.items():
+        try:
+            results[name] = dict(check(), ok=True)
+        except Exception as exc:
+            logger.warning("Readiness check %s failed: %s", name, exc)
+            results[name] = {"ok": False, "error": exc.__class__.__name__}
+            ok = False
+    return ok, results
+
+
+async def readiness() -> Tuple[bool, Dict[str, Any]]:
+    """(ready, details); cached for READINESS_CACHE_SECONDS."""
+    global _cached, _check_run
+    if draining:
+        return False, {"status": "draining"}
+    now = time.monotonic()
+    if _cached is not None and now - _cached[0] < settings.READINESS_CACHE_SECONDS:
+        return _cached[1], _cached[2]
+    if _check_run is None or _check_run.done():
+        _check_run = asyncio.ensure_future(run_in_threadpool(_run_checks))
+    try:
+        # Shielded: a timed-out probe must not cancel the run other probes are waiting on
+        ok, results = await asyncio.wait_for(asyncio.shield(_check_run), timeout=settings.READINESS_CHECK_TIMEOUT)
+    except asyncio.TimeoutError:
+        ok, results = False, {"error": "checks timed out"}
+    details = {"status": "ready" if ok else "not_ready", "checks": results}
+    _cached = (time.monotonic(), ok, details)
+    return ok, details
+
+
+def start_draining() -> None:
+    global draining
+    if not draining:
+        logger.info("Draining: reporting not ready")
+    draining = True
+
+
+def install_drain_handler() -> None:
+    """Report not ready on SIGTERM and delay the server's shutdown by SHUTDOWN_DELAY_SECONDS.
+
+    The server's own handlers (uvicorn, also under gunicorn) are installed before app startup;
+    ours replaces the SIGTERM one and hands over by raising SIGINT, which uvicorn treats as a
+    graceful shutdown too.
+    """
+    if settings.SHUTDOWN_DELAY_SECONDS <= 0:
+        return
+    loop = asyncio.get_running_loop()
+
+    def on_sigterm():
+        if draining:
+            return
+        start_draining()
+        loop.call_later(settings.SHUTDOWN_DELAY_SECONDS, os.kill, os.getpid(), signal.SIGINT)
+
+    try:
+        loop.add_signal_handler(signal.SIGTERM, on_sigterm)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Not on the main thread (e.g. TestClient) or no loop signal support (Windows)
+        pass
@@ -0,0 +1,271 @@
+"""
+Idempotency-Key support for POST requests.
+
+Mobile clients retry POSTs (e.g. /auth/register) on flaky networks, and a retry on a new
+connection can land on any gunicorn worker. When a request carries an ``Idempotency-Key``
+header, the key is claimed in the ``idempotency_keys`` table, which all workers share, with a
+single ``INSERT ... ON CONFLICT``. The first response (status, headers, body) is stored in that
+row and replayed for retries with the same key on any worker, without running the endpoint
+again (no bcrypt, no lookups: one primary-key statement). A retry that arrives while the
+original is still running, on this worker or another, polls the row and waits for it instead
+of executing in parallel.
+
+Keys are scoped by path and Authorization header (stored hashed), and bound to a hash of the
+request body: reusing a key for a different body is rejected with 422. 5xx responses are not
+stored so the client can retry them. A claim is a lease of IDEMPOTENCY_LEASE_SECONDS: if the
+worker holding it dies, the next retry after that takes the key over. Rows are kept for
+IDEMPOTENCY_TTL_SECONDS and then deleted by each worker's background purge.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05                # First wait between checks on an in-flight original (doubles)
+MAX_POLL_INTERVAL = 1.0
+PURGE_BATCH_SIZE = 1000
+
+_keys = IdempotencyKey.__table__
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IdempotencyStore:
+    """Claims and stored responses in ``idempotency_keys``; methods block (run them in the threadpool)."""
+
+    def __init__(self, ttl_seconds: int, lease_seconds: int, purge_interval: float):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.purge_interval = purge_interval
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def claim(self, key: str, fingerprint: str) -> Tuple[Optional[str], Optional[Any]]:
+        """Claim key for a new request: (owner token, None), or (None, the row holding it).
+
+        The row is None if it went away in between; claim again. An expired row (stored
+        response past its TTL, or a lease nobody completed) is taken over.
+        """
+        now = _utcnow()
+        owner = uuid.uuid4().hex
+        stmt = insert(_keys).values(key=key, fingerprint=fingerprint, owner=owner, expires_at=now + self.lease)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_keys.c.key],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "owner": stmt.excluded.owner,
+                "status": None,
+                "headers": None,
+                "body": None,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=_keys.c.expires_at <= now,
+        ).returning(_keys.c.owner)
+        with engine.begin() as conn:
+            if conn.scalar(stmt) is not None:
+                return owner, None
+            row = conn.execute(
+                select(_keys.c.fingerprint, _keys.c.status, _keys.c.headers, _keys.c.body).where(_keys.c.key == key)
+            ).first()
+        return None, row
+
+    def store(self, key: str, owner: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        """Keep the response of the request holding the claim for IDEMPOTENCY_TTL_SECONDS."""
+        with engine.begin() as conn:
+            conn.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key, IdempotencyKey.owner == owner)
+                .values(
+                    status=status,
+                    headers=[[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers],
+                    body=body,
+                    expires_at=_utcnow() + self.ttl,
+                )
+            )
+
+    def release(self, key: str, owner: str) -> None:
+        """Drop a claim whose response is not kept, so a retry runs the request again."""
+        with engine.begin() as conn:
+            conn.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.owner == owner, IdempotencyKey.status.is_(None)
+                )
+            )
+
+    def purge(self) -> int:
+        """Delete expired rows in batches; returns how many were deleted."""
+        deleted = 0
+        while not self._stopping.is_set():
+            expired = select(_keys.c.key).where(_keys.c.expires_at <= _utcnow()).limit(PURGE_BATCH_SIZE)
+            with engine.begin() as conn:
+                count = conn.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired.scalar_subquery()))).rowcount
+            deleted += count
+            if count < PURGE_BATCH_SIZE:
+                break
+        return deleted
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.purge_interval):
+            try:
+                self.purge()
+            except SQLAlchemyError:
+                logger.exception("Failed to purge expired idempotency keys, will retry")
+
+    def start(self) -> None:
+        """Start the background purge (call in each worker, after fork)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="idempotency-purge", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    lease_seconds=settings.IDEMPOTENCY_LEASE_SECONDS,
+    purge_interval=settings.IDEMPOTENCY_PURGE_SECONDS,
+)
+
+
+async def _send_json(send: Send, status: int, body: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _replay(send: Send, row: Any) -> None:
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in row.headers]
+    await send({"type": "http.response.start", "status": row.status, "headers": headers + [REPLAYED_HEADER]})
+    await send({"type": "http.response.body", "body": row.body})
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware replaying stored responses for repeated ``Idempotency-Key`` POSTs."""
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore = idempotency_store):
+        self.app = app
+        self.store = store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, b'{"detail":"Invalid Idempotency-Key header"}')
+            return
+
+        # Buffer the body so it can be fingerprinted, then hand it to the app unchanged
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = hashlib.sha256(b"\0".join((scope["path"].encode(), headers.get(b"authorization", b""), raw_key))).hexdigest()
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        delay = POLL_INTERVAL
+        while True:
+            try:
+                owner, row = await run_in_threadpool(self.store.claim, key, fingerprint)
+            except SQLAlchemyError:
+                logger.exception("Idempotency key lookup failed")
+                await _send_json(send, 503, b'{"detail":"Service temporarily unavailable. Please try again."}')
+                return
+            if owner is not None:
+                break
+            if row is None:
+                continue  # The original failed and released the key: claim it
+            if row.fingerprint != fingerprint:
+                await _send_json(send, 422, b'{"detail":"Idempotency-Key reused with a different request"}')
+                return
+            if row.status is not None:
+                await _replay(send, row)
+                return
+            if time.monotonic() >= deadline:
+                await _send_json(send, 409, b'{"detail":"A request with this Idempotency-Key is still in progress"}')
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_POLL_INTERVAL)
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response_status = 0
+        response_headers: list = []
+        response_body = []
+        response_size = 0
+
+        async def capture_send(message: Message) -> None:
+            nonlocal response_status, response_headers, response_size
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                response_size += len(chunk)
+                if response_size <= settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                    response_body.append(chunk)
+            await send(message)
+
+        stored = False
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            stored = 0 < response_status < 500 and response_size <= settings.IDEMPOTENCY_MAX_BODY_BYTES
+        finally:
+            try:
+                if stored:
+                    await run_in_threadpool(
+                        self.store.store, key, owner, response_status, response_headers, b"".join(response_body)
+                    )
+                else:
+                    await run_in_threadpool(self.store.release, key, owner)
+            except SQLAlchemyError:
+                # The claim stays until its lease runs out; retries wait (409) until then
+                logger.exception("Failed to save the response for an idempotency key")
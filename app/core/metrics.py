@@ -0,0 +1,30 @@
+"""
+Process-local counters, exposed as JSON on ``GET /metrics``.
+
+Each gunicorn worker has its own counters; aggregate across workers in the scraper.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+_lock = threading.Lock()
+_counters: Dict[str, Number] = defaultdict(int)
+
+
+def inc(name: str, value: Number = 1) -> None:
+    """Add value to the counter called name."""
+    with _lock:
+        _counters[name] += value
+
+
+def snapshot() -> Dict[str, Number]:
+    """Current value of every counter."""
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
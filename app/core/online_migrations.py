@@ -0,0 +1,340 @@
+"""
+Helpers for Alembic migrations that must not lock or rewrite large tables (PostgreSQL).
+
+Use them from ``alembic/versions`` instead of the plain ``op`` calls:
+
+    from app.core.online_migrations import (
+        add_column, backfill, create_index_concurrently, set_lock_timeout, set_not_null,
+    )
+
+    def upgrade() -> None:
+        set_lock_timeout("3s")
+        add_column("users", sa.Column("country", sa.String(), nullable=True))
+        backfill("users", "country = 'CI'", where="country IS NULL", name="users_country")
+        set_not_null("users", "country")
+        create_index_concurrently("ix_users_country", "users", ["country"])
+
+``lock_report`` classifies the SQL of a migration by the locks it takes; run it over
+``alembic upgrade --sql`` output with ``scripts/check_migration_locks.py`` (dry run).
+"""
+import logging
+import re
+import time
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+
+logger = logging.getLogger("alembic.runtime.online_migrations")
+
+CHECKPOINT_TABLE = "online_migration_checkpoints"
+
+# Defaults in ADD COLUMN that force a full table rewrite (constant defaults do not, PG 11+)
+VOLATILE_DEFAULT = re.compile(r"\b(now|random|gen_random_uuid|uuid_generate_v\d|clock_timestamp|nextval)\s*\(", re.I)
+
+
+def set_lock_timeout(timeout: str = "3s") -> None:
+    """Fail fast instead of queueing behind long transactions (and blocking everyone queued after us).
+
+    Session-level: applies to every following statement of the migration run.
+    """
+    op.execute(f"SET lock_timeout = '{timeout}'")
+
+
+def create_index_concurrently(
+    index_name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+) -> None:
+    """CREATE INDEX CONCURRENTLY (writes keep flowing while the index builds).
+
+    Runs outside the migration transaction. An invalid index left behind by an interrupted
+    concurrent build is dropped and rebuilt.
+    """
+    sql = "CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns}){where}".format(
+        unique="UNIQUE " if unique else "",
+        name=index_name,
+        table=table,
+        columns=", ".join(columns),
+        where=f" WHERE {where}" if where else "",
+    )
+    with context.get_context().autocommit_block():
+        if not context.is_offline_mode():
+            invalid = op.get_bind().execute(
+                sa.text(
+                    "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ),
+                {"name": index_name},
+            ).first()
+            if invalid:
+                logger.info("Dropping invalid index %s left by an earlier build", index_name)
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+        op.execute(sql)
+
+
+def drop_index_concurrently(index_name: str) -> None:
+    """DROP INDEX CONCURRENTLY, outside the migration transaction."""
+    with context.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    """ADD COLUMN that only touches the catalog: nullable, or NOT NULL with a constant default.
+
+    For NOT NULL columns without a default, add them nullable, ``backfill`` and ``set_not_null``.
+    """
+    default = column.server_default.arg if column.server_default is not None else None
+    if isinstance(default, str) or default is None:
+        default_sql = default
+    else:
+        default_sql = str(getattr(default, "text", default))
+    if not column.nullable and default_sql is None:
+        raise ValueError(
+            f"{table}.{column.name}: NOT NULL without a default fails on existing rows; "
+            "add it nullable, backfill, then set_not_null()"
+        )
+    if default_sql is not None and VOLATILE_DEFAULT.search(default_sql):
+        raise ValueError(f"{table}.{column.name}: volatile default {default_sql!r} rewrites the whole table")
+    op.add_column(table, column)
+
+
+def backfill(
+    table: str,
+    set_clause: str,
+    where: str = "TRUE",
+    name: Optional[str] = None,
+    key: str = "id",
+    batch_size: int = 1000,
+    pause: float = 0.1,
+    statement_timeout: str = "30s",
+) -> int:
+    """UPDATE table in key-ordered batches, each committed on its own.
+
+    ``where`` should exclude rows that are already done, so a rerun is harmless. Progress is
+    checkpointed (last key, in the same statement as the batch) in ``online_migration_checkpoints``
+    under ``name``, so an interrupted backfill resumes where it stopped; the checkpoint is removed
+    once the backfill completes. ``pause`` seconds of
+    sleep between batches leave room for production traffic and replication.
+    Returns the number of rows updated by this run.
+    """
+    name = name or f"{table}:{set_clause}"
+    if context.is_offline_mode():
+        op.execute(f"-- backfill {table} in batches of {batch_size}: UPDATE {table} SET {set_clause} WHERE {where}")
+        return 0
+
+    batch_sql = sa.text(f"""
+        WITH batch AS (
+            SELECT {key} FROM {table}
+            WHERE (CAST(:last_key AS text) IS NULL OR {key} > :last_key) AND ({where})
+            ORDER BY {key}
+            LIMIT :batch_size
+        ), updated AS (
+            UPDATE {table} SET {set_clause}
+            FROM batch WHERE {table}.{key} = batch.{key}
+            RETURNING {table}.{key}
+        )
+        INSERT INTO {CHECKPOINT_TABLE} (name, last_key, rows_done, updated_at)
+        SELECT :name, CAST((array_agg({key} ORDER BY {key} DESC))[1] AS text), count(*), now()
+        FROM updated HAVING count(*) > 0
+        ON CONFLICT (name) DO UPDATE SET
+            last_key = EXCLUDED.last_key,
+            rows_done = {CHECKPOINT_TABLE}.rows_done + EXCLUDED.rows_done,
+            updated_at = EXCLUDED.updated_at
+        RETURNING last_key, rows_done
+    """)
+
+    with context.get_context().autocommit_block():
+        conn = op.get_bind()
+        conn.execute(sa.text(
+            f"CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} ("
+            "name text PRIMARY KEY, last_key text, rows_done bigint NOT NULL DEFAULT 0, "
+            "updated_at timestamptz NOT NULL DEFAULT now())"
+        ))
+        conn.execute(sa.text(f"SET statement_timeout = '{statement_timeout}'"))
+        try:
+            rows_done, rows_before = _run_backfill(conn, batch_sql, name, key, batch_size, pause)
+        finally:
+            conn.execute(sa.text("SET statement_timeout = DEFAULT"))
+    return rows_done - rows_before
+
+
+def _run_backfill(conn, batch_sql, name: str, key: str, batch_size: int, pause: float):
+    """Run batches until none is left; returns (rows done in total, rows done before this run)."""
+    checkpoint = conn.execute(
+        sa.text(f"SELECT last_key, rows_done FROM {CHECKPOINT_TABLE} WHERE name = :name"), {"name": name}
+    ).first()
+    last_key, rows_before = (checkpoint.last_key, checkpoint.rows_done) if checkpoint else (None, 0)
+    if last_key is not None:
+        logger.info("Resuming backfill %s after %s = %s (%d rows done)", name, key, last_key, rows_before)
+    rows_done = rows_before
+    while True:
+        row = conn.execute(batch_sql, {"last_key": last_key, "batch_size": batch_size, "name": name}).first()
+        if row is None:
+            break
+        last_key, rows_done = row.last_key, row.rows_done
+        logger.info("Backfill %s: %d rows, up to %s = %s", name, rows_done, key, last_key)
+        time.sleep(pause)
+    # Finished: a later run (e.g. after a downgrade) starts from the beginning again
+    conn.execute(sa.text(f"DELETE FROM {CHECKPOINT_TABLE} WHERE name = :name"), {"name": name})
+    return rows_done, rows_before
+
+
+def add_check_constraint(name: str, table: str, condition: str) -> None:
+    """ADD CONSTRAINT ... CHECK NOT VALID, then VALIDATE (scans without blocking writes)."""
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID")
+    validate_constraint(table, name)
+
+
+def add_foreign_key(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    referent: str,
+    referent_columns: Sequence[str],
+    ondelete: Optional[str] = None,
+) -> None:
+    """ADD FOREIGN KEY ... NOT VALID, then VALIDATE (scans without blocking writes)."""
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({', '.join(columns)}) "
+        f"REFERENCES {referent} ({', '.join(referent_columns)})"
+        + (f" ON DELETE {ondelete}" if ondelete else "")
+        + " NOT VALID"
+    )
+    validate_constraint(table, name)
+
+
+def validate_constraint(table: str, name: str) -> None:
+    """VALIDATE CONSTRAINT in its own transaction (SHARE UPDATE EXCLUSIVE: reads and writes continue)."""
+    with context.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def set_not_null(table: str, column: str) -> None:
+    """SET NOT NULL without a long ACCESS EXCLUSIVE scan.
+
+    A validated CHECK (col IS NOT NULL) lets PostgreSQL 12+ skip the scan; the check is then dropped.
+    """
+    check = f"{table}_{column}_not_null"
+    add_check_constraint(check, table, f"{column} IS NOT NULL")
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {check}")
+
+
+class LockFinding(NamedTuple):
+    level: str          # "ok", "brief" (ACCESS EXCLUSIVE, catalog only) or "HEAVY"
+    lock: str
+    reason: str
+    statement: str
+
+
+# (pattern, level, lock, reason); first match wins
+_LOCK_RULES = [
+    (r"^--\s*backfill\b", "ok", "ROW EXCLUSIVE", "batched backfill, rows locked one batch at a time"),
+    (r"^(CREATE|DROP)\s+(UNIQUE\s+)?INDEX\s+CONCURRENTLY\b", "ok", "SHARE UPDATE EXCLUSIVE",
+     "concurrent index operation, reads and writes continue"),
+    (r"^CREATE\s+(UNIQUE\s+)?INDEX\b", "HEAVY", "SHARE", "blocks writes for the whole index build; use create_index_concurrently"),
+    (r"^DROP\s+INDEX\b", "brief", "ACCESS EXCLUSIVE", "use drop_index_concurrently"),
+    (r"^REINDEX\b(?!.*\bCONCURRENTLY\b)", "HEAVY", "ACCESS EXCLUSIVE", "blocks reads and writes; use REINDEX CONCURRENTLY"),
+    (r"^(DROP|TRUNCATE)\s+TABLE\b|^TRUNCATE\b", "HEAVY", "ACCESS EXCLUSIVE", "destroys data"),
+    (r"^(VACUUM\s+FULL|CLUSTER)\b", "HEAVY", "ACCESS EXCLUSIVE", "rewrites the table"),
+    (r"^ALTER\s+TABLE\b.*\bVALIDATE\s+CONSTRAINT\b", "ok", "SHARE UPDATE EXCLUSIVE", "validation, writes continue"),
+    (r"^ALTER\s+TABLE\b.*\bADD\s+CONSTRAINT\b.*\bNOT\s+VALID\b", "brief", "ACCESS EXCLUSIVE",
+     "constraint added without scanning existing rows"),
+    (r"^ALTER\s+TABLE\b.*\bADD\s+CONSTRAINT\b.*\bUSING\s+INDEX\b", "brief", "ACCESS EXCLUSIVE",
+     "constraint attached to an existing index"),
+    (r"^ALTER\s+TABLE\b.*\bADD\s+(CONSTRAINT\b.*\b)?(CHECK|FOREIGN\s+KEY)\b", "HEAVY", "ACCESS EXCLUSIVE",
+     "scans the table under lock; add NOT VALID then VALIDATE"),
+    (r"^ALTER\s+TABLE\b.*\bADD\s+(CONSTRAINT\b.*\b)?(UNIQUE|PRIMARY\s+KEY)\b", "HEAVY", "ACCESS EXCLUSIVE",
+     "builds an index under lock; build it concurrently and ADD CONSTRAINT ... USING INDEX"),
+    (r"^ALTER\s+TABLE\b.*\bALTER\s+(COLUMN\s+)?\S+\s+(SET\s+DATA\s+)?TYPE\b", "HEAVY", "ACCESS EXCLUSIVE",
+     "type change usually rewrites the table"),
+    (r"^ALTER\s+TABLE\b.*\bSET\s+NOT\s+NULL\b", "HEAVY", "ACCESS EXCLUSIVE",
+     "scans the table under lock unless a validated IS NOT NULL check exists (set_not_null)"),
+    (r"^ALTER\s+TABLE\b", "brief", "ACCESS EXCLUSIVE", "catalog-only change; guard with set_lock_timeout"),
+    (r"^(UPDATE|DELETE)\b(?!.*\bWHERE\b)", "HEAVY", "ROW EXCLUSIVE", "locks every row in one transaction; use backfill"),
+    (r"^(UPDATE|DELETE)\b", "ok", "ROW EXCLUSIVE", "check how many rows the WHERE clause matches"),
+]
+_COMPILED_RULES = [(re.compile(p, re.I | re.S), level, lock, reason) for p, level, lock, reason in _LOCK_RULES]
+
+
+def classify_statement(statement: str) -> Optional[LockFinding]:
+    """Lock taken by one SQL statement, or None if it does not touch existing tables."""
+    sql = statement.strip()
+    for pattern, level, lock, reason in _COMPILED_RULES:
+        if pattern.search(sql):
+            if level == "brief" and re.search(r"\bADD\s+(COLUMN\s+)?", sql, re.I):
+                default = re.search(r"\bDEFAULT\s+(.+)", sql, re.I)
+                if default and VOLATILE_DEFAULT.search(default.group(1)):
+                    return LockFinding("HEAVY", lock, "volatile default rewrites the table", sql)
+            return LockFinding(level, lock, reason, sql)
+    return None
+
+
+def split_statements(sql_script: str) -> Iterable[str]:
+    """Statements of an ``alembic upgrade --sql`` script (our ``-- backfill`` markers included)."""
+    statement: List[str] = []
+    for line in sql_script.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("--"):
+            if stripped.startswith("-- backfill"):
+                yield stripped
+            continue
+        if not stripped:
+            continue
+        statement.append(line)
+        if stripped.endswith(";"):
+            yield "\n".join(statement).rstrip(";").strip()
+            statement = []
+    if statement:
+        yield "\n".join(statement).strip()
+
+
+_NOT_NULL_CHECK = re.compile(
+    r"^ALTER\s+TABLE\s+([\w.\"]+)\s+ADD\s+CONSTRAINT\s+([\w\"]+)\s+CHECK\s*\(\s*([\w\"]+)\s+IS\s+NOT\s+NULL\s*\)", re.I
+)
+_VALIDATE = re.compile(r"^ALTER\s+TABLE\s+([\w.\"]+)\s+VALIDATE\s+CONSTRAINT\s+([\w\"]+)", re.I)
+_SET_NOT_NULL = re.compile(r"^ALTER\s+TABLE\s+([\w.\"]+)\s+ALTER\s+(?:COLUMN\s+)?([\w\"]+)\s+SET\s+NOT\s+NULL", re.I)
+_CREATE_TABLE = re.compile(r"^CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?([\w.\"]+)", re.I)
+_TARGET_TABLE = re.compile(r"^(?:CREATE\s+(?:UNIQUE\s+)?INDEX\b.*?\bON\s+|ALTER\s+TABLE\s+(?:ONLY\s+)?)([\w.\"]+)", re.I | re.S)
+
+
+def lock_report(sql_script: str) -> List[LockFinding]:
+    """Findings for every statement of a migration script that takes a table lock.
+
+    Index builds and ALTERs on tables created earlier in the same script are reported as ok:
+    those tables are still empty when the statement runs. SET NOT NULL preceded by a validated
+    ``CHECK (col IS NOT NULL)`` (see ``set_not_null``) is reported as brief.
+    """
+    created = set()
+    not_null_checks = {}        # (table, constraint) -> column
+    validated_not_null = set()  # (table, column)
+    findings = []
+    for statement in split_statements(sql_script):
+        new_table = _CREATE_TABLE.match(statement)
+        if new_table:
+            created.add(new_table.group(2).strip('"').lower())
+            continue
+        check = _NOT_NULL_CHECK.match(statement)
+        if check:
+            table, constraint, column = (g.strip('"').lower() for g in check.groups())
+            not_null_checks[(table, constraint)] = column
+        validate = _VALIDATE.match(statement)
+        if validate:
+            table, constraint = (g.strip('"').lower() for g in validate.groups())
+            if (table, constraint) in not_null_checks:
+                validated_not_null.add((table, not_null_checks[(table, constraint)]))
+
+        finding = classify_statement(statement)
+        if finding is None:
+            continue
+        set_not_null_ = _SET_NOT_NULL.match(statement)
+        if set_not_null_ and tuple(g.strip('"').lower() for g in set_not_null_.groups()) in validated_not_null:
+            finding = finding._replace(level="brief", reason="uses the validated IS NOT NULL check, no scan")
+        target = _TARGET_TABLE.match(statement)
+        if finding.level != "ok" and target and target.group(1).strip('"').lower() in created:
+            finding = finding._replace(level="ok", reason="table created earlier in this run, still empty")
+        findings.append(finding)
+    return findings
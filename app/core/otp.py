@@ -0,0 +1,130 @@
+"""
+One-time codes for phone verification.
+
+A code is derived from HMAC(SECRET_KEY, phone, time window) rather than stored, so whichever
+worker receives the verify request can check it. Codes from the current and the previous window
+are accepted, i.e. a code stays valid between OTP_TTL_SECONDS and twice that.
+
+Limits live in ``phone_otp_limits`` (one row per phone), shared by all workers, and each check
+is a single atomic upsert: a phone gets at most one SMS per OTP_RESEND_SECONDS, and at most
+OTP_MAX_ATTEMPTS codes may be tried per OTP_ATTEMPT_WINDOW_SECONDS, whichever worker handles the
+request and however many codes were sent. The attempt is counted before the code is checked,
+so concurrent guesses can't slip past the limit. Callers only pass phones of registered users
+whose phone is not verified yet, so junk numbers add no rows; a phone's row is deleted once it
+is verified.
+
+Each worker also remembers the phones it found blocked (cooling down or locked) in a
+timing-wheel store until the block ends, so repeated requests for them cost no query.
+"""
+import hashlib
+import hmac
+import math
+import time
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import case, delete, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.sms import SmsSender
+from app.core.timing_wheel import TimingWheelStore
+from app.models.otp import PhoneOtpLimit
+
+_limits = PhoneOtpLimit.__table__
+
+
+class OtpResult(str, Enum):
+    VERIFIED = "verified"
+    INVALID = "invalid"
+    LOCKED = "locked"          # Too many attempts in the current window
+
+
+# ("send" | "verify", phone) -> True until the cooldown or lock ends (a cache of the DB's answer)
+_blocked = TimingWheelStore(
+    max_ttl=max(settings.OTP_RESEND_SECONDS, settings.OTP_ATTEMPT_WINDOW_SECONDS),
+    max_entries=settings.OTP_MAX_ENTRIES,
+)
+
+
+def _window(now: Optional[float] = None) -> int:
+    return int((now if now is not None else time.time()) // settings.OTP_TTL_SECONDS)
+
+
+def _code_for(phone: str, window: int) -> str:
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"otp:{phone}:{window}".encode(),
+        hashlib.sha256,
+    ).digest()
+    return str(int.from_bytes(digest[:8], "big") % 10 ** settings.OTP_LENGTH).zfill(settings.OTP_LENGTH)
+
+
+def _block(kind: str, phone: str, seconds: float) -> None:
+    if seconds > 0:
+        _blocked.set((kind, phone), True, ttl=min(seconds, _blocked.max_ttl))
+
+
+def send_otp(db: Session, phone: str, sender: SmsSender) -> int:
+    """Send a code to phone. Returns 0 if sent, else seconds to wait before resending."""
+    wait = _blocked.ttl(("send", phone))
+    if wait:
+        return math.ceil(wait)
+    now = time.time()
+    stmt = insert(_limits).values(phone=phone, sent_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_limits.c.phone],
+        set_={"sent_at": stmt.excluded.sent_at},
+        where=or_(_limits.c.sent_at.is_(None), _limits.c.sent_at <= now - settings.OTP_RESEND_SECONDS),
+    ).returning(_limits.c.phone)
+    if db.scalar(stmt) is None:
+        sent_at = db.scalar(select(_limits.c.sent_at).where(_limits.c.phone == phone))
+        db.commit()
+        wait = (sent_at or now) + settings.OTP_RESEND_SECONDS - now
+        _block("send", phone, wait)
+        return max(1, math.ceil(wait))
+    db.commit()
+    code = _code_for(phone, _window(now))
+    sender.send(phone, f"Your {settings.PROJECT_NAME} verification code is {code}")
+    _block("send", phone, settings.OTP_RESEND_SECONDS)
+    return 0
+
+
+def verify_otp(db: Session, phone: str, code: str) -> OtpResult:
+    """Check a code, counting the attempt against the phone's limit first.
+
+    Only call it for a registered phone that is not verified yet.
+    """
+    if _blocked.get(("verify", phone)):
+        return OtpResult.LOCKED
+    now = time.time()
+    window_over = or_(
+        _limits.c.window_start.is_(None),
+        _limits.c.window_start <= now - settings.OTP_ATTEMPT_WINDOW_SECONDS,
+    )
+    stmt = insert(_limits).values(phone=phone, attempts=1, window_start=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_limits.c.phone],
+        set_={
+            "attempts": case((window_over, 1), else_=_limits.c.attempts + 1),
+            "window_start": case((window_over, now), else_=_limits.c.window_start),
+        },
+    ).returning(_limits.c.attempts, _limits.c.window_start)
+    attempts, window_start = db.execute(stmt).one()
+    window_ends = window_start + settings.OTP_ATTEMPT_WINDOW_SECONDS
+
+    if attempts > settings.OTP_MAX_ATTEMPTS:
+        db.commit()
+        _block("verify", phone, window_ends - now)
+        return OtpResult.LOCKED
+    window = _window(now)
+    if any(hmac.compare_digest(code, _code_for(phone, w)) for w in (window, window - 1)):
+        db.execute(delete(PhoneOtpLimit).where(PhoneOtpLimit.phone == phone))
+        db.commit()
+        return OtpResult.VERIFIED
+    db.commit()
+    if attempts >= settings.OTP_MAX_ATTEMPTS:
+        _block("verify", phone, window_ends - now)
+        return OtpResult.LOCKED
+    return OtpResult.INVALID
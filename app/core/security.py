@@ -1,11 +1,30 @@
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
+# New hashes use PASSWORD_HASH_SCHEME with the configured cost. The other scheme stays listed
+# (deprecated) so existing hashes still verify; those, and hashes of the configured scheme with
+# another cost, report needs_update() and are rehashed at login (crud.user.authenticate_user).
+pwd_context = CryptContext(
+    schemes=sorted(PASSWORD_SCHEMES, key=lambda scheme: scheme != settings.PASSWORD_HASH_SCHEME),
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2__time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+    argon2__memory_cost=settings.PASSWORD_ARGON2_MEMORY_KIB,
+    argon2__parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -13,9 +32,65 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_update(hashed_password: str) -> bool:
+    """True if the hash was made with another scheme or cost than the configured one"""
+    return pwd_context.needs_update(hashed_password)
+
+
 def get_password_hash(password: str) -> str:
-    """Hash a password (bcrypt limit 72 bytes)."""
-    return pwd_context.hash(password[:72] if isinstance(password, str) else password)
+    """Hash a password with the configured scheme (bcrypt limit 72 bytes)."""
+    if settings.PASSWORD_HASH_SCHEME == "bcrypt" and isinstance(password, str):
+        password = password[:72]
+    return pwd_context.hash(password)
+
+
+class KeyRing:
+    """Asymmetric JWT keys, parsed once per process.
+
+    Every ``<kid>.pem`` in JWT_KEYS_DIR verifies tokens carrying that ``kid``; JWT_ACTIVE_KID
+    (which must be a private key) signs new ones. Keeping the previous key's file during a
+    rotation lets tokens it signed stay valid until they expire.
+    """
+
+    def __init__(self, keys_dir: str, active_kid: str, algorithm: str):
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self.verify_keys: Dict[str, Key] = {}
+        self.signing_key: Optional[Key] = None
+        for filename in sorted(os.listdir(keys_dir)):
+            if not filename.endswith(".pem"):
+                continue
+            kid = filename[: -len(".pem")]
+            with open(os.path.join(keys_dir, filename), "rb") as f:
+                key = jwk.construct(f.read(), algorithm)
+            public = key if key.is_public() else key.public_key()
+            self.verify_keys[kid] = public
+            if kid == active_kid:
+                if key.is_public():
+                    raise ValueError(f"JWT_ACTIVE_KID {kid!r} must be a private key")
+                self.signing_key = key
+        if self.signing_key is None:
+            raise ValueError(f"No key file for JWT_ACTIVE_KID {active_kid!r} in {keys_dir}")
+
+        # Serialized once: the JWKS response never changes for the life of the process
+        jwks = {
+            "keys": [
+                dict(key.to_dict(), kid=kid, use="sig", alg=algorithm)
+                for kid, key in self.verify_keys.items()
+            ]
+        }
+        self.jwks_json = json.dumps(jwks, separators=(",", ":")).encode()
+        self.jwks_etag = '"' + hashlib.sha256(self.jwks_json).hexdigest()[:32] + '"'
+
+
+@lru_cache
+def get_key_ring() -> Optional[KeyRing]:
+    """The configured key ring, or None when tokens are signed with SECRET_KEY (HS*)."""
+    if settings.ALGORITHM.startswith("HS"):
+        return None
+    if not settings.JWT_KEYS_DIR or not settings.JWT_ACTIVE_KID:
+        raise ValueError(f"ALGORITHM={settings.ALGORITHM} requires JWT_KEYS_DIR and JWT_ACTIVE_KID")
+    return KeyRing(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID, settings.ALGORITHM)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -27,15 +102,35 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
+    key_ring = get_key_ring()
+    if key_ring is not None:
+        return jwt.encode(
+            to_encode, key_ring.signing_key, algorithm=key_ring.algorithm, headers={"kid": key_ring.active_kid}
+        )
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode a JWT token"""
+    """Decode a JWT token.
+
+    Tokens with a ``kid`` are checked against the key ring, tokens without one against
+    SECRET_KEY. Once asymmetric keys are in use, kid-less (HS256) tokens are only accepted
+    until JWT_LEGACY_HS256_UNTIL, so SECRET_KEY stops being able to mint tokens after the switch.
+    """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if settings.ALGORITHM.startswith("HS"):
+                return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            cutoff = settings.JWT_LEGACY_HS256_UNTIL
+            if cutoff is None or datetime.now(timezone.utc) >= cutoff:
+                return None
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        key_ring = get_key_ring()
+        key = key_ring.verify_keys.get(kid) if key_ring is not None else None
+        if key is None:
+            return None
+        return jwt.decode(token, key, algorithms=[key_ring.algorithm])
     except JWTError:
         return None
-
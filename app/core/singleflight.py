@@ -0,0 +1,56 @@
+"""
+Single-flight call coalescing.
+
+Concurrent calls with the same key share one execution: the first caller (the leader) runs the
+function, callers arriving while it runs wait for its result (or exception) instead of running
+it again. Nothing is cached once the call completes.
+
+Callers are threads (sync FastAPI handlers and dependencies run in the threadpool); a caller
+joining an in-flight call blocks its thread until the leader is done.
+
+Counters: ``singleflight.<name>.calls`` and ``singleflight.<name>.coalesced``.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core import metrics
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """The in-flight call for key, and whether the caller must run it (leader)."""
+        metrics.inc(f"singleflight.{self.name}.calls")
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                metrics.inc(f"singleflight.{self.name}.coalesced")
+                return call, False
+            call = self._calls[key] = Future()
+            return call, True
+
+    def _complete(self, key: Hashable, call: Future, result: Any = None, exc: Optional[BaseException] = None) -> None:
+        with self._lock:
+            del self._calls[key]
+        if exc is not None:
+            call.set_exception(exc)
+        else:
+            call.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn once for all concurrent callers of key. Returns (result, shared)."""
+        call, leader = self._join(key)
+        if not leader:
+            return call.result(), True
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._complete(key, call, exc=exc)
+            raise
+        self._complete(key, call, result)
+        return result, False
@@ -0,0 +1,48 @@
+"""
+Outgoing SMS.
+
+The sender is chosen by ``SMS_BACKEND``, which must be set: the dotted path of a sender class,
+e.g. ``"app.integrations.orange:OrangeSmsSender"``, or ``"stub"``, which logs messages (codes
+included) and keeps the last ones in memory, for local runs and tests only. A sender only needs
+a ``send(phone, message)`` method. The app loads it at startup, so a missing backend stops the
+server instead of failing the first OTP request.
+"""
+import importlib
+import logging
+from collections import deque
+from functools import lru_cache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SmsSender:
+    """Base class for SMS providers."""
+
+    def send(self, phone: str, message: str) -> None:
+        raise NotImplementedError
+
+
+class StubSmsSender(SmsSender):
+    """Logs messages instead of sending them; the last ones are kept in ``outbox``."""
+
+    def __init__(self, maxlen: int = 100):
+        self.outbox = deque(maxlen=maxlen)
+
+    def send(self, phone: str, message: str) -> None:
+        self.outbox.append((phone, message))
+        logger.info("SMS to %s: %s", phone, message)
+
+
+@lru_cache
+def get_sms_sender() -> SmsSender:
+    """The configured SMS sender (one instance per process)."""
+    backend = settings.SMS_BACKEND
+    if not backend:
+        raise RuntimeError('SMS_BACKEND is not set: use "package.module:SenderClass", or "stub" for local runs')
+    if backend == "stub":
+        logger.warning("SMS_BACKEND=stub: verification codes are logged, not sent")
+        return StubSmsSender()
+    module_name, _, class_name = backend.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
@@ -0,0 +1,117 @@
+"""
+In-memory expiring key/value store backed by a timing wheel.
+
+Each entry sits in the wheel slot of the tick it expires on. Advancing the clock clears only
+the slots that have elapsed, so expiry costs O(entries that expire) instead of a sweep over the
+whole store, and get/set/pop stay O(1). The store is bounded: when full, the entries closest to
+expiry are evicted first.
+"""
+import math
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TimingWheelStore:
+    """Thread-safe TTL store; TTLs may not exceed max_ttl (one turn of the wheel)."""
+
+    def __init__(self, max_ttl: float, tick: float = 1.0, max_entries: int = 100_000):
+        self.tick = tick
+        self.max_ttl = max_ttl
+        self.max_entries = max_entries
+        self._n_slots = int(math.ceil(max_ttl / tick)) + 1
+        self._slots = [set() for _ in range(self._n_slots)]
+        self._data: Dict[Hashable, Tuple[Any, int]] = {}  # key -> (value, expiry tick)
+        self._current = self._now_tick()
+        self._lock = threading.Lock()
+
+    def _now_tick(self) -> int:
+        return int(time.monotonic() / self.tick)
+
+    def _advance(self) -> None:
+        """Expire everything in the slots between the last seen tick and now."""
+        now = self._now_tick()
+        if now <= self._current:
+            return
+        for i in range(1, min(now - self._current, self._n_slots) + 1):
+            slot = self._slots[(self._current + i) % self._n_slots]
+            for key in slot:
+                del self._data[key]
+            slot.clear()
+        self._current = now
+
+    def _remove(self, key: Hashable) -> Optional[Any]:
+        item = self._data.pop(key, None)
+        if item is None:
+            return None
+        value, expires = item
+        self._slots[expires % self._n_slots].discard(key)
+        return value
+
+    def _evict_soonest(self) -> None:
+        for i in range(1, self._n_slots + 1):
+            slot = self._slots[(self._current + i) % self._n_slots]
+            if slot:
+                del self._data[slot.pop()]
+                return
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._advance()
+            return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            self._advance()
+            item = self._data.get(key)
+            return item[0] if item is not None else None
+
+    def ttl(self, key: Hashable) -> Optional[float]:
+        """Seconds until key expires (tick resolution), or None if absent."""
+        with self._lock:
+            self._advance()
+            item = self._data.get(key)
+            if item is None:
+                return None
+            return (item[1] - self._current) * self.tick
+
+    def _insert(self, key: Hashable, value: Any, ttl: float) -> None:
+        if ttl <= 0 or ttl > self.max_ttl:
+            raise ValueError(f"ttl must be in (0, {self.max_ttl}]")
+        if len(self._data) >= self.max_entries:
+            self._evict_soonest()
+        expires = self._current + max(1, int(math.ceil(ttl / self.tick)))
+        self._data[key] = (value, expires)
+        self._slots[expires % self._n_slots].add(key)
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._advance()
+            self._remove(key)
+            self._insert(key, value, ttl)
+
+    def setdefault(self, key: Hashable, value: Any, ttl: float, evict: bool = True) -> Optional[Any]:
+        """Return the live value for key, storing value (with ttl) first if there is none.
+
+        With evict=False a full store is left alone and None is returned instead.
+        """
+        with self._lock:
+            self._advance()
+            item = self._data.get(key)
+            if item is not None:
+                return item[0]
+            if not evict and len(self._data) >= self.max_entries:
+                return None
+            self._insert(key, value, ttl)
+            return value
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            self._advance()
+            return self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            for slot in self._slots:
+                slot.clear()
@@ -1,5 +1,4 @@
-from app.crud import user
-
-__all__ = ["user"]
+from app.crud import user, audit, fleet, trip
 
+__all__ = ["user", "audit", "fleet", "trip"]
 
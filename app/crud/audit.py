@@ -0,0 +1,26 @@
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+
+from app.models import AuditEvent
+
+
+def get_audit_events(
+    db: Session,
+    target_id: Optional[UUID] = None,
+    actor_id: Optional[UUID] = None,
+    action: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = 100,
+) -> List[AuditEvent]:
+    """Newest-first page of audit events, keyset-paginated on id (pass the last id as before_id)."""
+    query = db.query(AuditEvent)
+    if target_id is not None:
+        query = query.filter(AuditEvent.target_id == target_id)
+    if actor_id is not None:
+        query = query.filter(AuditEvent.actor_id == actor_id)
+    if action is not None:
+        query = query.filter(AuditEvent.action == action)
+    if before_id is not None:
+        query = query.filter(AuditEvent.id < before_id)
+    return query.order_by(AuditEvent.id.desc()).limit(limit).all()
@@ -0,0 +1,147 @@
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.models import Company, CompanyDriver, User, Vehicle
+from app.schemas.fleet import CompanyCreate, VehicleCreate, VehicleUpdate
+
+
+def get_company_by_owner(db: Session, owner_id: UUID) -> Optional[Company]:
+    """Get the company managed by a user"""
+    return db.query(Company).filter(Company.owner_id == owner_id).first()
+
+
+def create_company(db: Session, owner_id: UUID, company_in: CompanyCreate) -> Company:
+    """Create a company managed by owner_id"""
+    db_company = Company(owner_id=owner_id, **company_in.model_dump())
+    db.add(db_company)
+    db.commit()
+    db.refresh(db_company)
+    return db_company
+
+
+def get_driver_membership(db: Session, driver_id: UUID) -> Optional[CompanyDriver]:
+    """The company membership of a driver, if any"""
+    return db.query(CompanyDriver).filter(CompanyDriver.driver_id == driver_id).first()
+
+
+def add_driver(db: Session, company_id: UUID, driver_id: UUID) -> CompanyDriver:
+    """Add a driver to a company's fleet"""
+    membership = CompanyDriver(company_id=company_id, driver_id=driver_id)
+    db.add(membership)
+    db.commit()
+    db.refresh(membership)
+    return membership
+
+
+def remove_driver(db: Session, company_id: UUID, driver_id: UUID) -> bool:
+    """Remove a driver from the fleet, unassigning the company's vehicle they drove"""
+    removed = (
+        db.query(CompanyDriver)
+        .filter(CompanyDriver.company_id == company_id, CompanyDriver.driver_id == driver_id)
+        .delete(synchronize_session=False)
+    )
+    if removed:
+        db.execute(
+            update(Vehicle)
+            .where(Vehicle.company_id == company_id, Vehicle.driver_id == driver_id)
+            .values(driver_id=None)
+        )
+    db.commit()
+    return removed > 0
+
+
+def get_fleet_drivers(
+    db: Session,
+    company_id: UUID,
+    after: Optional[UUID] = None,
+    limit: int = 100,
+    is_active: Optional[bool] = None,
+    is_kyc_verified: Optional[bool] = None,
+) -> List[Any]:
+    """One page of the fleet's drivers with their status and vehicle, in a single query.
+
+    Keyset-paginated on driver id (pass the last id as ``after``); rows are plain column
+    tuples, not ORM objects. Vehicles are unique per driver, so the outer join adds no rows.
+    """
+    query = (
+        select(
+            CompanyDriver.driver_id.label("id"),
+            User.full_name,
+            User.phone,
+            User.email,
+            User.is_active,
+            User.is_kyc_verified,
+            User.kyc_documents_status,
+            User.is_phone_verified,
+            CompanyDriver.joined_at,
+            Vehicle.id.label("vehicle_id"),
+            Vehicle.plate_number.label("vehicle_plate_number"),
+        )
+        .join(User, User.id == CompanyDriver.driver_id)
+        .outerjoin(Vehicle, and_(Vehicle.driver_id == CompanyDriver.driver_id, Vehicle.company_id == company_id))
+        .where(CompanyDriver.company_id == company_id)
+    )
+    if after is not None:
+        query = query.where(CompanyDriver.driver_id > after)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+    if is_kyc_verified is not None:
+        query = query.where(User.is_kyc_verified == is_kyc_verified)
+    return db.execute(query.order_by(CompanyDriver.driver_id).limit(limit)).all()
+
+
+def get_fleet_summary(db: Session, company_id: UUID) -> Dict[str, int]:
+    """Driver and vehicle counts of a fleet (two aggregate queries, no rows loaded)"""
+    drivers = db.execute(
+        select(
+            func.count().label("drivers"),
+            func.count().filter(User.is_active).label("active_drivers"),
+            func.count().filter(User.is_kyc_verified).label("kyc_verified_drivers"),
+        )
+        .select_from(CompanyDriver)
+        .join(User, User.id == CompanyDriver.driver_id)
+        .where(CompanyDriver.company_id == company_id)
+    ).one()
+    vehicles = db.execute(
+        select(
+            func.count().label("vehicles"),
+            func.count().filter(Vehicle.is_active).label("active_vehicles"),
+        ).where(Vehicle.company_id == company_id)
+    ).one()
+    return {**drivers._asdict(), **vehicles._asdict()}
+
+
+def get_vehicle(db: Session, company_id: UUID, vehicle_id: UUID) -> Optional[Vehicle]:
+    """Get one of a company's vehicles"""
+    return db.query(Vehicle).filter(Vehicle.company_id == company_id, Vehicle.id == vehicle_id).first()
+
+
+def get_vehicles(db: Session, company_id: UUID, after: Optional[UUID] = None, limit: int = 100) -> List[Vehicle]:
+    """A company's vehicles, keyset-paginated on id"""
+    query = db.query(Vehicle).filter(Vehicle.company_id == company_id)
+    if after is not None:
+        query = query.filter(Vehicle.id > after)
+    return query.order_by(Vehicle.id).limit(limit).all()
+
+
+def create_vehicle(db: Session, company_id: UUID, vehicle_in: VehicleCreate) -> Vehicle:
+    """Register a vehicle in a company's fleet"""
+    db_vehicle = Vehicle(company_id=company_id, **vehicle_in.model_dump())
+    db.add(db_vehicle)
+    db.commit()
+    db.refresh(db_vehicle)
+    return db_vehicle
+
+
+def update_vehicle(db: Session, db_vehicle: Vehicle, vehicle_update: VehicleUpdate) -> Vehicle:
+    """Assign/unassign the driver or (de)activate a vehicle"""
+    update_data = vehicle_update.model_dump(exclude_unset=True)
+    if update_data.get("is_active") is None:
+        update_data.pop("is_active", None)
+    for field, value in update_data.items():
+        setattr(db_vehicle, field, value)
+    db.commit()
+    db.refresh(db_vehicle)
+    return db_vehicle
@@ -0,0 +1,224 @@
+"""
+Trips and seat reservations.
+
+Booking never locks or updates the trip row: each seat is a row of ``trip_seats`` and is
+claimed with a conditional UPDATE (``... WHERE <seat is free> RETURNING``). A seat is free when
+it has no reservation or its hold has expired, so expired holds need no cleanup job.
+
+- Any N seats: the candidate seats are picked with ``FOR UPDATE SKIP LOCKED``, so concurrent
+  bookings of a popular departure take different seats instead of queueing behind each other.
+- Specific seats: the UPDATE is a per-seat compare-and-set; if another booking got one of the
+  seats first, fewer rows come back and the whole hold is rolled back.
+
+Either way a seat can only be held by one reservation at a time, so trips cannot be oversold.
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.core.config import settings
+from app.models import Reservation, ReservationStatus, Trip, TripSeat
+from app.schemas.trip import TripCreate
+
+
+def _seat_is_free(now: datetime):
+    return or_(TripSeat.reservation_id.is_(None), TripSeat.held_until < now)
+
+
+def _seats_available(now: datetime):
+    """Correlated count of a trip's free seats"""
+    return (
+        select(func.count())
+        .where(TripSeat.trip_id == Trip.id, _seat_is_free(now))
+        .correlate(Trip)
+        .scalar_subquery()
+        .label("seats_available")
+    )
+
+
+def create_trip(db: Session, company_id: UUID, trip_in: TripCreate, seats_total: int) -> Trip:
+    """Create a trip and its seats (numbered 1..seats_total)"""
+    db_trip = Trip(company_id=company_id, seats_total=seats_total, **trip_in.model_dump())
+    db.add(db_trip)
+    db.flush()
+    db.execute(
+        insert(TripSeat),
+        [{"trip_id": db_trip.id, "seat_number": number} for number in range(1, seats_total + 1)],
+    )
+    db.commit()
+    db.refresh(db_trip)
+    return db_trip
+
+
+def get_trip(db: Session, trip_id: UUID) -> Optional[Trip]:
+    """Get a trip by ID"""
+    return db.query(Trip).filter(Trip.id == trip_id).first()
+
+
+def get_trip_with_availability(db: Session, trip_id: UUID) -> Optional[Any]:
+    """Trip columns plus seats_available"""
+    now = datetime.now(timezone.utc)
+    return db.execute(select(*Trip.__table__.c, _seats_available(now)).where(Trip.id == trip_id)).first()
+
+
+def search_trips(
+    db: Session,
+    origin: str,
+    destination: str,
+    departure_from: datetime,
+    departure_to: datetime,
+    limit: int = 50,
+) -> List[Any]:
+    """Departures on a route within a time window, soonest first, with their free seat count"""
+    now = datetime.now(timezone.utc)
+    query = (
+        select(*Trip.__table__.c, _seats_available(now))
+        .where(
+            Trip.origin == origin,
+            Trip.destination == destination,
+            Trip.departure_at >= max(departure_from, now),
+            Trip.departure_at < departure_to,
+        )
+        .order_by(Trip.departure_at)
+        .limit(limit)
+    )
+    return db.execute(query).all()
+
+
+def get_available_seat_numbers(db: Session, trip_id: UUID) -> List[int]:
+    """Free seats of a trip"""
+    now = datetime.now(timezone.utc)
+    query = (
+        select(TripSeat.seat_number)
+        .where(TripSeat.trip_id == trip_id, _seat_is_free(now))
+        .order_by(TripSeat.seat_number)
+    )
+    return list(db.scalars(query))
+
+
+def get_reservation_seat_numbers(db: Session, reservation_id: UUID) -> List[int]:
+    """Seats currently held or sold by a reservation"""
+    query = select(TripSeat.seat_number).where(TripSeat.reservation_id == reservation_id).order_by(TripSeat.seat_number)
+    return list(db.scalars(query))
+
+
+def get_reservations_seat_numbers(db: Session, reservation_ids: Sequence[UUID]) -> Dict[UUID, List[int]]:
+    """Seats currently held or sold by each of the reservations, in one query"""
+    seat_numbers: Dict[UUID, List[int]] = {reservation_id: [] for reservation_id in reservation_ids}
+    if not seat_numbers:
+        return seat_numbers
+    query = (
+        select(TripSeat.reservation_id, TripSeat.seat_number)
+        .where(TripSeat.reservation_id.in_(seat_numbers))
+        .order_by(TripSeat.reservation_id, TripSeat.seat_number)
+    )
+    for reservation_id, seat_number in db.execute(query):
+        seat_numbers[reservation_id].append(seat_number)
+    return seat_numbers
+
+
+def hold_seats(
+    db: Session,
+    trip: Trip,
+    user_id: UUID,
+    seats: Optional[int] = None,
+    seat_numbers: Optional[List[int]] = None,
+) -> Tuple[Optional[Reservation], List[int]]:
+    """Hold `seats` free seats, or exactly `seat_numbers`, for SEAT_HOLD_SECONDS.
+
+    Returns (reservation, seat numbers), or (None, []) when not enough of the seats are free.
+    """
+    now = datetime.now(timezone.utc)
+    count = len(seat_numbers) if seat_numbers is not None else seats
+    reservation = Reservation(
+        trip_id=trip.id,
+        user_id=user_id,
+        status=ReservationStatus.HELD,
+        seats=count,
+        expires_at=now + timedelta(seconds=settings.SEAT_HOLD_SECONDS),
+    )
+    db.add(reservation)
+    db.flush()
+
+    if seat_numbers is not None:
+        wanted = TripSeat.seat_number.in_(seat_numbers)
+    else:
+        wanted = TripSeat.seat_number.in_(
+            select(TripSeat.seat_number)
+            .where(TripSeat.trip_id == trip.id, _seat_is_free(now))
+            .order_by(TripSeat.seat_number)
+            .limit(count)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+    claimed = db.scalars(
+        update(TripSeat)
+        .where(TripSeat.trip_id == trip.id, wanted, _seat_is_free(now))  # Re-checked on the latest row version
+        .values(reservation_id=reservation.id, held_until=reservation.expires_at)
+        .returning(TripSeat.seat_number)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if len(claimed) != count:
+        db.rollback()
+        return None, []
+    db.commit()
+    db.refresh(reservation)
+    return reservation, sorted(claimed)
+
+
+def confirm_reservation(db: Session, reservation: Reservation) -> bool:
+    """Turn a hold into a sale. False (and the reservation marked expired) if the hold ran out."""
+    now = datetime.now(timezone.utc)
+    confirmed = db.execute(
+        update(TripSeat)
+        .where(TripSeat.reservation_id == reservation.id, TripSeat.held_until >= now)
+        .values(held_until=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if confirmed < reservation.seats:
+        # Some seats expired (and may be resold already): release the rest
+        db.rollback()
+        release_reservation(db, reservation, ReservationStatus.EXPIRED)
+        return False
+    reservation.status = ReservationStatus.CONFIRMED
+    reservation.confirmed_at = now
+    db.commit()
+    db.refresh(reservation)
+    return True
+
+
+def release_reservation(
+    db: Session,
+    reservation: Reservation,
+    status: ReservationStatus = ReservationStatus.CANCELLED,
+) -> Reservation:
+    """Free the reservation's seats and set its final status"""
+    db.execute(
+        update(TripSeat)
+        .where(TripSeat.reservation_id == reservation.id)
+        .values(reservation_id=None, held_until=None)
+        .execution_options(synchronize_session=False)
+    )
+    reservation.status = status
+    db.commit()
+    db.refresh(reservation)
+    return reservation
+
+
+def get_reservation(db: Session, reservation_id: UUID) -> Optional[Reservation]:
+    """Get a reservation by ID"""
+    return db.query(Reservation).filter(Reservation.id == reservation_id).first()
+
+
+def get_user_reservations(db: Session, user_id: UUID, skip: int = 0, limit: int = 100) -> List[Reservation]:
+    """A user's reservations, newest first"""
+    return (
+        db.query(Reservation)
+        .filter(Reservation.user_id == user_id)
+        .order_by(Reservation.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
@@ -1,15 +1,28 @@
+from sqlalchemy import Row, and_, any_, bindparam, case, cast, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.orm import Session
-from typing import Optional, Union
+from sqlalchemy.sql import func
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
 
 from app.models import User, UserRole
-from app.schemas.user import UserCreate, UserCreateDriver, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.schemas.user import BULK_UPDATE_MAX_USERS, UserBulkChanges, UserBulkFilter, UserCreate, UserCreateDriver, UserOut, UserUpdate
+from app.core.audit import audit_log
+from app.core.availability import user_availability
+from app.core.fieldsets import SparseFieldsets
+from app.core import metrics
+from app.core.security import get_password_hash, password_needs_update, verify_password
+from app.core.singleflight import SingleFlight
 
+# Changes to these fields are written to the audit log
+AUDITED_FIELDS = ("role", "is_active", "is_superuser", "is_kyc_verified", "kyc_documents_status")
 
+
+# ORM lookups, in the caller's session and transaction (use these before writing). Read-only
+# callers should prefer the get_user_record* functions below, which coalesce concurrent lookups.
 def get_user(db: Session, user_id: UUID) -> Optional[User]:
     """Get a user by ID"""
-    return db.query(User).filter(User.id == user_id).first()
+    return db.get(User, user_id)
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -22,9 +35,65 @@ def get_user_by_phone(db: Session, phone: str) -> Optional[User]:
     return db.query(User).filter(User.phone == phone).first()
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    """Get a list of users"""
-    return db.query(User).offset(skip).limit(limit).all()
+def _is_registered(db: Session, column, value: str, maybe: bool) -> bool:
+    metrics.inc("availability.checks")
+    if not maybe:
+        metrics.inc("availability.db_skipped")
+        return False
+    registered = db.scalar(select(User.id).where(column == value).limit(1)) is not None
+    if not registered:
+        metrics.inc("availability.false_positives")
+    return registered
+
+
+def is_phone_registered(db: Session, phone: str) -> bool:
+    """Whether a user has this phone; the availability filter answers most "no"s without a query"""
+    return _is_registered(db, User.phone, phone, user_availability.might_have_phone(phone))
+
+
+def is_email_registered(db: Session, email: str) -> bool:
+    """Whether a user has this email; the availability filter answers most "no"s without a query"""
+    return _is_registered(db, User.email, email, user_availability.might_have_email(email))
+
+
+# Read-only path: only the columns of the public representation (UserOut), as plain rows.
+# No hashed_password, no ORM instances or identity map; rows are immutable, so concurrent
+# lookups can share one without attaching it to a session.
+# Callers can narrow the columns further with a sparse fieldset (?fields=).
+user_fieldsets = SparseFieldsets(UserOut, User)
+USER_PUBLIC_COLUMNS = user_fieldsets.full.columns
+UserRecord = Row  # Row with USER_PUBLIC_COLUMNS (attribute access like a User)
+_user_record_lookups = SingleFlight("user_record_lookup")
+
+
+def _lookup_user_record(db: Session, column, value, columns: Sequence = USER_PUBLIC_COLUMNS) -> Optional[UserRecord]:
+    def load():
+        return db.execute(select(*columns).where(column == value)).first()
+
+    record, _ = _user_record_lookups.do((column.key, value, tuple(c.key for c in columns)), load)
+    return record
+
+
+def get_user_record(db: Session, user_id: UUID, columns: Sequence = USER_PUBLIC_COLUMNS) -> Optional[UserRecord]:
+    """Public columns (or the given subset) of a user, by ID (read-only)"""
+    return _lookup_user_record(db, User.id, user_id, columns)
+
+
+def get_user_record_by_phone(db: Session, phone: str) -> Optional[UserRecord]:
+    """Public columns of a user, by phone number (read-only)"""
+    return _lookup_user_record(db, User.phone, phone)
+
+
+def get_user_record_by_email(db: Session, email: str) -> Optional[UserRecord]:
+    """Public columns of a user, by email (read-only)"""
+    return _lookup_user_record(db, User.email, email)
+
+
+def get_user_records(
+    db: Session, skip: int = 0, limit: int = 100, columns: Sequence = USER_PUBLIC_COLUMNS
+) -> List[UserRecord]:
+    """Public columns (or the given subset) of a page of users (read-only)"""
+    return db.execute(select(*columns).order_by(User.id).offset(skip).limit(limit)).all()
 
 
 def create_user(
@@ -45,34 +114,132 @@ def create_user(
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    user_availability.add(phone=db_user.phone, email=db_user.email)
     return db_user
 
 
-def update_user(db: Session, user_id: UUID, user_update: UserUpdate) -> Optional[User]:
-    """Update a user"""
-    db_user = get_user(db, user_id)
+def update_user(
+    db: Session,
+    user_id: UUID,
+    user_update: UserUpdate,
+    actor_id: Optional[UUID] = None,
+) -> Optional[User]:
+    """Update a user; changes to sensitive fields are audited with actor_id as the author."""
+    # Locked until commit, so the audited old values are the ones this update replaces
+    db_user = db.get(User, user_id, with_for_update=True)
     if not db_user:
         return None
     
     update_data = user_update.model_dump(exclude_unset=True)
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+    if update_data.get("is_kyc_verified") and not db_user.is_kyc_verified:
+        update_data["kyc_verified_at"] = func.now()
+
+    changes = {
+        field: (getattr(db_user, field), update_data[field])
+        for field in AUDITED_FIELDS
+        if field in update_data and getattr(db_user, field) != update_data[field]
+    }
     
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
     db.commit()
     db.refresh(db_user)
+    if update_data.get("email") is not None:
+        user_availability.add(email=db_user.email)
+    if changes:
+        audit_log.record("user.updated", target_id=db_user.id, actor_id=actor_id, changes=changes)
     return db_user
 
 
-def delete_user(db: Session, user_id: UUID) -> bool:
+def bulk_update_users(
+    db: Session,
+    changes: UserBulkChanges,
+    ids: Optional[List[UUID]] = None,
+    user_filter: Optional[UserBulkFilter] = None,
+    actor_id: Optional[UUID] = None,
+) -> Tuple[List[UUID], List[UUID]]:
+    """Apply changes to the users with the given ids (or matching user_filter) in one UPDATE.
+
+    Returns (updated ids, requested ids not found). Old values of audited fields come back from
+    the same statement (UPDATE ... FROM a locked snapshot of the rows ... RETURNING).
+
+    Raises ValueError, changing nothing, if user_filter matches more than BULK_UPDATE_MAX_USERS
+    users.
+    """
+    values: Dict[str, Any] = changes.model_dump(exclude_none=True)
+    if values.get("is_kyc_verified"):
+        # Keep the original approval time of users already verified
+        values["kyc_verified_at"] = case((User.is_kyc_verified, User.kyc_verified_at), else_=func.now())
+
+    if ids is not None:
+        condition = User.id == any_(cast(bindparam("ids", list(ids)), ARRAY(PG_UUID(as_uuid=True))))
+    else:
+        condition = and_(*(getattr(User, field) == value for field, value in user_filter.model_dump(exclude_none=True).items()))
+
+    audited = [field for field in AUDITED_FIELDS if field in values]
+    old = select(User.id, *(getattr(User, field) for field in audited)).where(condition).with_for_update()
+    if ids is None:
+        # One row over the cap tells an oversized filter apart without locking all its rows
+        old = old.order_by(User.id).limit(BULK_UPDATE_MAX_USERS + 1)
+    old = old.subquery("old")
+    stmt = (
+        update(User)
+        .where(User.id == old.c.id)
+        .values(values)
+        .returning(User.id, *(old.c[field] for field in audited))
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.execute(stmt).all()
+    if len(rows) > BULK_UPDATE_MAX_USERS:
+        db.rollback()
+        raise ValueError(f"Filter matches more than {BULK_UPDATE_MAX_USERS} users; narrow it or give ids")
+    db.commit()
+
+    updated = []
+    for row in rows:
+        user_id, old_values = row[0], row[1:]
+        updated.append(user_id)
+        diff = {
+            field: (before, values[field])
+            for field, before in zip(audited, old_values)
+            if before != values[field]
+        }
+        if diff:
+            audit_log.record("user.updated", target_id=user_id, actor_id=actor_id, changes=diff)
+
+    found = set(updated)
+    not_found = [user_id for user_id in dict.fromkeys(ids) if user_id not in found] if ids is not None else []
+    return updated, not_found
+
+
+def mark_phone_verified(db: Session, phone: str) -> bool:
+    """Flag a user's phone as verified in a single UPDATE. False if no user has this phone."""
+    updated = (
+        db.query(User)
+        .filter(User.phone == phone)
+        .update({User.is_phone_verified: True, User.phone_verified_at: func.now()}, synchronize_session=False)
+    )
+    db.commit()
+    return updated > 0
+
+
+def delete_user(db: Session, user_id: UUID, actor_id: Optional[UUID] = None) -> bool:
     """Delete a user"""
-    db_user = get_user(db, user_id)
+    db_user = db.get(User, user_id, with_for_update=True)
     if not db_user:
         return False
     db.delete(db_user)
     db.commit()
+    user_availability.discard(phone=db_user.phone, email=db_user.email)
+    audit_log.record(
+        "user.deleted",
+        target_id=user_id,
+        actor_id=actor_id,
+        changes={"phone": (db_user.phone, None), "role": (db_user.role, None)},
+    )
     return True
 
 
@@ -83,5 +250,23 @@ def authenticate_user(db: Session, identifier: str, password: str) -> Optional[U
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    if password_needs_update(user.hashed_password):
+        _rehash_password(db, user, password)
     return user
 
+
+def _rehash_password(db: Session, user: User, password: str) -> None:
+    """Store a hash with the configured scheme and cost, now that we have the plain password.
+
+    Conditional on the old hash, so a password changed meanwhile is not overwritten; updated_at
+    is left alone, this is not a change to the account.
+    """
+    result = db.execute(
+        update(User)
+        .where(User.id == user.id, User.hashed_password == user.hashed_password)
+        .values(hashed_password=get_password_hash(password), updated_at=User.updated_at)
+    )
+    db.commit()
+    if result.rowcount:
+        metrics.inc("auth.passwords_rehashed")
+
@@ -1,6 +1,14 @@
 from app.models.base import Base
 from app.models.user import User, UserRole
+from app.models.audit import AuditEvent
+from app.models.idempotency import IdempotencyKey
+from app.models.otp import PhoneOtpLimit
+from app.models.fleet import Company, CompanyDriver, Vehicle
+from app.models.trip import Reservation, ReservationStatus, Trip, TripSeat
 
-__all__ = ["Base", "User", "UserRole"]
+__all__ = [
+    "Base", "User", "UserRole", "AuditEvent", "IdempotencyKey", "PhoneOtpLimit", "Company", "CompanyDriver",
+    "Vehicle", "Trip", "TripSeat", "Reservation", "ReservationStatus",
+]
 
 
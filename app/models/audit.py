@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, JSON, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class AuditEvent(Base):
+    """Append-only record of a sensitive change (never updated or deleted by the app)."""
+
+    __tablename__ = "audit_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)          # Keyset pagination key
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    actor_id = Column(UUID(as_uuid=True), nullable=True, index=True)       # Who made the change (no FK: events outlive users)
+    target_id = Column(UUID(as_uuid=True), nullable=True)                 # User the change applies to
+    action = Column(String, nullable=False)                                # "user.updated" or "user.deleted"
+    changes = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)  # {"field": [old, new], ...}
+
+    __table_args__ = (
+        Index("ix_audit_events_target_id_id", "target_id", "id"),
+    )
@@ -0,0 +1,56 @@
+import uuid
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Company(Base):
+    """Transport company, managed by a user with role driver_company."""
+
+    __tablename__ = "companies"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True)  # One company per account
+    name = Column(String, nullable=False)
+    registration_number = Column(String, unique=True, nullable=True)     # RCCM number, once provided
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+
+class CompanyDriver(Base):
+    """Membership of a driver in a company's fleet (a driver works for at most one company)."""
+
+    __tablename__ = "company_drivers"
+
+    # (company_id, driver_id) is also the keyset pagination index for fleet listings
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    driver_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    joined_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_company_drivers_driver_id", "driver_id", unique=True),
+    )
+
+
+class Vehicle(Base):
+    __tablename__ = "vehicles"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    driver_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)  # Driver currently assigned
+    plate_number = Column(String, unique=True, nullable=False)
+    make = Column(String, nullable=True)
+    model = Column(String, nullable=True)
+    seats = Column(Integer, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index("ix_vehicles_company_id_id", "company_id", "id"),
+        # A driver drives one vehicle at a time, so fleet listings join at most one vehicle per driver
+        Index("ix_vehicles_driver_id", "driver_id", unique=True, postgresql_where=text("driver_id IS NOT NULL")),
+    )
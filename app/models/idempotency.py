@@ -0,0 +1,16 @@
+from sqlalchemy import Column, DateTime, Integer, JSON, LargeBinary, String
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """An Idempotency-Key claimed by a request, then its stored response (see app.core.idempotency)."""
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(64), primary_key=True)                             # sha256 of path, Authorization and the key
+    fingerprint = Column(String(64), nullable=False)                       # sha256 of the request body
+    owner = Column(String(32), nullable=False)                             # Request that claimed the key
+    status = Column(Integer, nullable=True)                                # NULL while that request is in flight
+    headers = Column(JSON, nullable=True)                                  # [[name, value], ...] (latin-1)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # End of the claim's lease, then of the TTL
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Float, Integer, String
+from app.core.database import Base
+
+
+class PhoneOtpLimit(Base):
+    """Resend cooldown and attempt counter of a phone being verified, shared by all workers (see app.core.otp)."""
+
+    __tablename__ = "phone_otp_limits"
+
+    phone = Column(String, primary_key=True)
+    sent_at = Column(Float, nullable=True)                                 # Unix time the last code was sent
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # Codes tried since window_start
+    window_start = Column(Float, nullable=True)                            # Unix time the attempt window opened
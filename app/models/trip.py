@@ -0,0 +1,74 @@
+import uuid
+from datetime import datetime, timezone
+from enum import Enum as PyEnum
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ReservationStatus(str, PyEnum):
+    HELD = "held"                  # Seats held until expires_at
+    CONFIRMED = "confirmed"
+    CANCELLED = "cancelled"
+    EXPIRED = "expired"            # Hold ran out before confirmation (seats may be resold)
+
+
+class Trip(Base):
+    """A scheduled intercity departure sold by a company."""
+
+    __tablename__ = "trips"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
+    vehicle_id = Column(UUID(as_uuid=True), ForeignKey("vehicles.id", ondelete="SET NULL"), nullable=True, index=True)
+    origin = Column(String, nullable=False)                                # e.g. "Abidjan"
+    destination = Column(String, nullable=False)                           # e.g. "Yamoussoukro"
+    departure_at = Column(DateTime(timezone=True), nullable=False)
+    price = Column(Integer, nullable=False)                                # Per seat, in XOF
+    seats_total = Column(Integer, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_trips_route_departure", "origin", "destination", "departure_at"),
+    )
+
+
+class TripSeat(Base):
+    """One seat of a trip. It is free when not reserved, or when its hold has expired.
+
+    Seats are claimed with conditional UPDATEs on these rows (never on the trip row), so
+    concurrent bookings of one departure only contend for the seats they actually take.
+    """
+
+    __tablename__ = "trip_seats"
+
+    trip_id = Column(UUID(as_uuid=True), ForeignKey("trips.id", ondelete="CASCADE"), primary_key=True)
+    seat_number = Column(Integer, primary_key=True)
+    reservation_id = Column(UUID(as_uuid=True), ForeignKey("reservations.id", ondelete="SET NULL"), nullable=True, index=True)
+    held_until = Column(DateTime(timezone=True), nullable=True)            # NULL with a reservation: sold
+
+
+class Reservation(Base):
+    __tablename__ = "reservations"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    trip_id = Column(UUID(as_uuid=True), ForeignKey("trips.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(
+        Enum(ReservationStatus, values_callable=lambda obj: [e.value for e in obj]),
+        nullable=False,
+        default=ReservationStatus.HELD,
+    )
+    seats = Column(Integer, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)          # End of the hold
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    confirmed_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def current_status(self) -> ReservationStatus:
+        """Status, reporting holds past expires_at as expired"""
+        if self.status == ReservationStatus.HELD and self.expires_at < datetime.now(timezone.utc):
+            return ReservationStatus.EXPIRED
+        return self.status
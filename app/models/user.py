@@ -1,6 +1,6 @@
 import uuid
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -33,9 +33,16 @@ class User(Base):
     is_kyc_verified = Column(Boolean, default=False, nullable=False)
     kyc_verified_at = Column(DateTime(timezone=True), nullable=True)
     kyc_documents_status = Column(String, nullable=True)                   # e.g. "pending", "approved", "rejected", JSON later if needed
+    is_phone_verified = Column(Boolean, default=False, nullable=False)     # Set once an OTP sent to `phone` is verified
+    phone_verified_at = Column(DateTime(timezone=True), nullable=True)
     
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)          # Keep for flexibility, but role covers most cases
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        # Users created or changed since a point in time (availability filter refresh)
+        Index("ix_users_changed_at", func.coalesce(updated_at, created_at)),
+    )
@@ -1,6 +1,23 @@
-from app.schemas.user import User, UserCreate, UserUpdate, UserInDB
+from app.schemas.user import (
+    User, UserCreate, UserUpdate, UserAdminUpdate, UserInDB, UserBulkChanges, UserBulkFilter, UserBulkUpdate,
+    UserBulkResult,
+)
 from app.schemas.token import Token, TokenData
+from app.schemas.audit import AuditEvent, AuditEventPage
+from app.schemas.fleet import (
+    Company, CompanyCreate, FleetDriver, FleetDriverAdd, FleetDriverPage, FleetSummary, Vehicle, VehicleCreate,
+    VehiclePage, VehicleUpdate,
+)
+from app.schemas.fare import FarePair, FareQuote, FareQuoteRequest, FareQuoteResponse, FareStops
+from app.schemas.trip import Reservation, ReservationCreate, Trip, TripCreate, TripDetail
 
-__all__ = ["User", "UserCreate", "UserUpdate", "UserInDB", "Token", "TokenData"]
+__all__ = [
+    "User", "UserCreate", "UserUpdate", "UserAdminUpdate", "UserInDB", "UserBulkChanges", "UserBulkFilter",
+    "UserBulkUpdate", "UserBulkResult", "Token", "TokenData",
+    "AuditEvent", "AuditEventPage", "Company", "CompanyCreate", "FleetDriver", "FleetDriverAdd", "FleetDriverPage",
+    "FleetSummary", "Vehicle", "VehicleCreate", "VehiclePage", "VehicleUpdate",
+    "Trip", "TripCreate", "TripDetail", "Reservation", "ReservationCreate",
+    "FarePair", "FareQuote", "FareQuoteRequest", "FareQuoteResponse", "FareStops",
+]
 
 
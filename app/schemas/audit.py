@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class AuditEvent(BaseModel):
+    id: int
+    created_at: datetime
+    actor_id: Optional[UUID] = None
+    target_id: Optional[UUID] = None
+    action: str
+    changes: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
+
+
+class AuditEventPage(BaseModel):
+    items: List[AuditEvent]
+    next_before_id: Optional[int] = None     # Pass as `before_id` to get the next (older) page
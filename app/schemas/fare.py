@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.core.config import settings
+from app.core.fares import OPERATOR_ROLES
+from app.models.user import UserRole
+
+
+class FarePair(BaseModel):
+    origin: str
+    destination: str
+
+
+class FareQuoteRequest(BaseModel):
+    pairs: List[FarePair] = Field(..., min_length=1, max_length=settings.FARE_MAX_BATCH)
+    operator_role: UserRole = Field(UserRole.DRIVER_COMPANY, description="driver_company or driver_individual pricing")
+
+    @field_validator("operator_role")
+    @classmethod
+    def check_operator_role(cls, v: UserRole) -> UserRole:
+        if v not in OPERATOR_ROLES:
+            raise ValueError("operator_role must be driver_company or driver_individual")
+        return v
+
+
+class FareQuote(BaseModel):
+    origin: str
+    destination: str
+    distance_km: Optional[float] = None      # null (with price) for unknown stops or origin == destination
+    price: Optional[int] = None
+
+
+class FareQuoteResponse(BaseModel):
+    operator_role: UserRole
+    currency: str = "XOF"
+    quotes: List[FareQuote]
+
+
+class FareStops(BaseModel):
+    stops: List[str]
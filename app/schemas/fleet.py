@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, EmailStr, Field
+
+
+class CompanyCreate(BaseModel):
+    name: str = Field(..., min_length=1)
+    registration_number: Optional[str] = None
+
+
+class Company(BaseModel):
+    id: UUID
+    owner_id: UUID
+    name: str
+    registration_number: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class FleetDriverAdd(BaseModel):
+    phone: str = Field(..., pattern=r"^\+225[0-9]{8}$", description="Phone of a registered driver_individual")
+
+
+class FleetDriver(BaseModel):
+    """A driver of the fleet with KYC/activity status and assigned vehicle"""
+    id: UUID
+    full_name: Optional[str] = None
+    phone: str
+    email: Optional[EmailStr] = None
+    is_active: bool
+    is_kyc_verified: bool
+    kyc_documents_status: Optional[str] = None
+    is_phone_verified: bool
+    joined_at: datetime
+    vehicle_id: Optional[UUID] = None
+    vehicle_plate_number: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FleetDriverPage(BaseModel):
+    items: List[FleetDriver]
+    next_after: Optional[UUID] = None        # Pass as `after` to get the next page
+
+
+class FleetSummary(BaseModel):
+    drivers: int
+    active_drivers: int
+    kyc_verified_drivers: int
+    vehicles: int
+    active_vehicles: int
+
+
+class VehicleCreate(BaseModel):
+    plate_number: str = Field(..., min_length=1)
+    make: Optional[str] = None
+    model: Optional[str] = None
+    seats: int = Field(..., ge=1, le=100)
+    driver_id: Optional[UUID] = None
+
+
+class VehicleUpdate(BaseModel):
+    """Set driver_id to null to unassign the driver"""
+    driver_id: Optional[UUID] = None
+    is_active: Optional[bool] = None
+
+
+class Vehicle(BaseModel):
+    id: UUID
+    company_id: UUID
+    driver_id: Optional[UUID] = None
+    plate_number: str
+    make: Optional[str] = None
+    model: Optional[str] = None
+    seats: int
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class VehiclePage(BaseModel):
+    items: List[Vehicle]
+    next_after: Optional[UUID] = None
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+
+class OtpRequest(BaseModel):
+    phone: str = Field(..., pattern=r"^\+225[0-9]{8}$", description="Ivorian phone number format")
+
+
+class OtpVerify(OtpRequest):
+    code: str = Field(..., pattern=r"^[0-9]{4,10}$")
+
+
+class OtpSent(BaseModel):
+    expires_in: int      # Seconds the code stays valid (at least)
+    resend_in: int       # Seconds before another code can be requested
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import AwareDatetime, BaseModel, Field, model_validator
+
+from app.models.trip import ReservationStatus
+
+
+class TripCreate(BaseModel):
+    vehicle_id: UUID = Field(..., description="One of the company's vehicles; sets the number of seats")
+    origin: str = Field(..., min_length=1)
+    destination: str = Field(..., min_length=1)
+    departure_at: AwareDatetime = Field(..., description="With a UTC offset, e.g. 2025-06-01T08:00:00Z")
+    price: int = Field(..., ge=0, description="Per seat, in XOF")
+
+
+class Trip(BaseModel):
+    id: UUID
+    company_id: UUID
+    vehicle_id: Optional[UUID] = None
+    origin: str
+    destination: str
+    departure_at: datetime
+    price: int
+    seats_total: int
+    seats_available: int
+
+    class Config:
+        from_attributes = True
+
+
+class TripDetail(Trip):
+    available_seat_numbers: List[int]
+
+
+class ReservationCreate(BaseModel):
+    """Either a number of seats (any free ones) or specific seat numbers"""
+    seats: Optional[int] = Field(None, ge=1)
+    seat_numbers: Optional[List[int]] = Field(None, min_length=1)
+
+    @model_validator(mode="after")
+    def check_seats(self):
+        if (self.seats is None) == (self.seat_numbers is None):
+            raise ValueError("Give exactly one of seats or seat_numbers")
+        if self.seat_numbers is not None and len(set(self.seat_numbers)) != len(self.seat_numbers):
+            raise ValueError("Duplicate seat numbers")
+        return self
+
+
+class Reservation(BaseModel):
+    id: UUID
+    trip_id: UUID
+    status: ReservationStatus = Field(validation_alias="current_status")
+    seats: int
+    seat_numbers: List[int] = []
+    expires_at: datetime
+    created_at: datetime
+    confirmed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
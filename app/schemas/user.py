@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -35,6 +35,69 @@ class UserUpdate(BaseModel):
     # Admins can update role/kyc in separate privileged endpoint
 
 
+class UserAdminUpdate(UserUpdate):
+    """Fields only admins may change (role, KYC, privileges)"""
+    role: Optional[UserRole] = None
+    is_kyc_verified: Optional[bool] = None
+    kyc_documents_status: Optional[str] = None
+    is_superuser: Optional[bool] = None
+
+
+BULK_UPDATE_MAX_USERS = 1000     # Users one bulk update may change (ids given or matched by a filter)
+
+
+class UserBulkChanges(BaseModel):
+    """Changes applied to every selected user (is_kyc_verified=true also stamps kyc_verified_at)"""
+    is_active: Optional[bool] = None
+    role: Optional[UserRole] = None
+    is_kyc_verified: Optional[bool] = None
+    kyc_documents_status: Optional[str] = None
+    is_superuser: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("No changes given")
+        return self
+
+
+class UserBulkFilter(BaseModel):
+    """Selects users matching all given fields"""
+    role: Optional[UserRole] = None
+    is_active: Optional[bool] = None
+    is_kyc_verified: Optional[bool] = None
+    kyc_documents_status: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("Empty filter; use explicit ids to update users")
+        return self
+
+
+class UserBulkUpdate(BaseModel):
+    """Either `ids` or `filter` selects the users (at most BULK_UPDATE_MAX_USERS)"""
+    ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=BULK_UPDATE_MAX_USERS)
+    filter: Optional[UserBulkFilter] = None
+    changes: UserBulkChanges
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Give exactly one of ids or filter")
+        return self
+
+
+class UserBulkResult(BaseModel):
+    updated: List[UUID]
+    not_found: List[UUID] = []      # Requested ids with no user
+
+
+class Availability(BaseModel):
+    phone_available: Optional[bool] = None      # null when not asked
+    email_available: Optional[bool] = None
+
+
 class UserInDB(BaseModel):
     id: UUID
     phone: str
@@ -43,6 +106,7 @@ class UserInDB(BaseModel):
     role: UserRole
     is_kyc_verified: bool
     kyc_verified_at: Optional[datetime] = None
+    is_phone_verified: bool = False
     is_active: bool
     is_superuser: bool
     created_at: datetime
@@ -0,0 +1,98 @@
+"""
+Gunicorn configuration for production.
+
+Gunicorn picks this file up automatically when started from the backend root:
+
+  gunicorn main:app
+
+The app is imported once in the master (``preload_app``) and then forked, so imported
+modules, compiled Pydantic schemas and the password-hash backend are shared copy-on-write between
+workers. Each worker then drops the DB pool it inherited from the master.
+"""
+import gc
+import os
+
+from app.core.config import settings
+
+
+def _available_cpus() -> int:
+    """CPUs this process may use, honouring cgroup CPU quotas (containers) and affinity."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            q, period = f.read().split()
+            if q != "max":
+                quota = int(q) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                q = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if q > 0:
+                quota = q / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        cpus = min(cpus, max(1, int(quota)))
+    return max(1, cpus)
+
+
+bind = os.environ.get("BIND", f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '8000')}")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = settings.WEB_CONCURRENCY or _available_cpus()
+
+preload_app = True
+max_requests = settings.MAX_REQUESTS
+max_requests_jitter = settings.MAX_REQUESTS_JITTER
+graceful_timeout = settings.GRACEFUL_TIMEOUT
+timeout = 60
+keepalive = settings.KEEPALIVE
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """Runs in the master once the app is preloaded, before any worker is forked."""
+    # Load the password-hash backend, JWT keys and fare route table now so workers inherit them
+    from app.core.security import get_key_ring, pwd_context
+
+    pwd_context.handler().get_backend()
+    get_key_ring()
+    try:
+        from app.core.fares import get_route_table
+
+        get_route_table()  # Workers share the memory-mapped distance matrix
+    except (OSError, ValueError) as exc:
+        server.log.warning("Fare route table not loaded: %s", exc)
+
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.core.availability import user_availability
+
+    try:
+        user_availability.build()  # One scan of users for all workers; they refresh it from there
+    except SQLAlchemyError as exc:
+        server.log.warning("Availability filter not built (workers will build it): %s", exc)
+
+    # Move everything allocated so far out of the GC's reach: collections in the workers
+    # then never touch (and so never copy) the pages holding the preloaded app.
+    gc.collect()
+    gc.freeze()
+    server.log.info("App preloaded, starting %s workers", workers)
+
+
+def post_fork(server, worker):
+    """Each worker starts with its own empty DB pool."""
+    from app.core.database import dispose_engine_after_fork
+
+    dispose_engine_after_fork()
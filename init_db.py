@@ -3,7 +3,7 @@ Script to initialize the database.
 Run this after setting up your .env file and creating the PostgreSQL database.
 """
 from app.core.database import engine, Base
-from app.models import User  # Import all models
+from app.models import User, AuditEvent, Company, CompanyDriver, Vehicle, Trip, TripSeat, Reservation  # Import all models
 
 if __name__ == "__main__":
     print("Creating database tables...")
@@ -1,24 +1,61 @@
-from fastapi import FastAPI, Request
+import hmac
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.core.config import settings
+from app.api import health as health_api, jwks
 from app.api.v1 import api_router
+from app.core import health, metrics
+from app.core.audit import audit_log
+from app.core.availability import user_availability
+from app.core.compression import CompressionMiddleware
 from app.core.database import engine
+from app.core.idempotency import IdempotencyMiddleware, idempotency_store
+from app.core.security import get_key_ring
+from app.core.sms import get_sms_sender
 from app.models import Base
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Per-worker startup/shutdown (runs after the fork when preloaded by gunicorn)."""
+    get_key_ring()  # Fail at startup, not on the first request, if a key file is missing or invalid
+    get_sms_sender()  # Likewise if SMS_BACKEND is unset or can't be imported
+    audit_log.start()
+    idempotency_store.start()  # Purges expired Idempotency-Key responses
+    user_availability.start()  # Builds the filter unless the gunicorn master already did
+    health.install_drain_handler()
+    yield
+    await run_in_threadpool(user_availability.stop)
+    await run_in_threadpool(idempotency_store.stop)
+    await run_in_threadpool(audit_log.stop)  # Flush buffered audit events
+    engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# Replay responses for retried POSTs carrying an Idempotency-Key (inside CORS)
+app.add_middleware(IdempotencyMiddleware)
+
+# gzip/brotli for large responses (outside idempotency so replays follow the retry's Accept-Encoding)
+app.add_middleware(CompressionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -34,7 +71,7 @@ async def validation_exception_handler(_request: Request, exc: RequestValidation
     """Return 422 with clear validation errors."""
     return JSONResponse(
         status_code=422,
-        content={"detail": exc.errors()},
+        content={"detail": jsonable_encoder(exc.errors())},
     )
 
 
@@ -62,6 +99,8 @@ async def sqlalchemy_error_handler(_request: Request, exc: SQLAlchemyError):
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(jwks.router, tags=["authentication"])
+app.include_router(health_api.router, tags=["health"])
 
 
 @app.get("/")
@@ -69,8 +108,13 @@ def read_root():
     return {"message": "Welcome to Waren Voyage API"}
 
 
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+@app.get("/metrics", include_in_schema=False)
+def read_metrics(authorization: str = Header("")):
+    """Counters of this worker process (for scrapers holding METRICS_TOKEN)"""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    return metrics.snapshot()
 
 
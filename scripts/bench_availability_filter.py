@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+False-positive rate, memory and speed of the phone/email availability filter at scale.
+
+Builds the filter the way the app does (AVAILABILITY_* settings, keys added in batches as the
+streaming scan delivers them) for N synthetic users, a share of them with an email, then
+probes phones and emails that are not registered and reports:
+  - the build time and the filter's size (total and bits per key), next to the memory a Python
+    set of the same keys would take (estimated from a sample)
+  - the measured false-positive rate (probes that would still query the database) against
+    the configured target
+  - the time of one check, which is all an unregistered value costs when the filter says no
+
+No database is used; the users only exist in memory.
+
+Usage:
+  cd backend
+  python scripts/bench_availability_filter.py                  # 10M users
+  python scripts/bench_availability_filter.py --users 1000000 --probes 200000 --email-share 0.5
+
+Needs the same .env as the app (settings only).
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_ROOT)
+
+from app.core.availability import BloomFilter, email_key, phone_key  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+def user_keys(start: int, stop: int, email_every: int):
+    """Keys of users start..stop: phones +225 followed by even numbers, some with an email."""
+    keys = []
+    for i in range(start, stop):
+        keys.append(phone_key(f"+225{2 * i:08d}"))
+        if email_every and i % email_every == 0:
+            keys.append(email_key(f"user{i}@example.com"))
+    return keys
+
+
+def set_bytes_per_key(sample: list) -> float:
+    """Memory of a Python set of bytes keys, per key (set table plus the key objects)."""
+    return (sys.getsizeof(set(sample)) + sum(sys.getsizeof(key) for key in sample)) / len(sample)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000_000)
+    parser.add_argument("--email-share", type=float, default=0.3, help="Share of users with an email")
+    parser.add_argument("--probes", type=int, default=1_000_000, help="Unregistered phones (and as many emails) to check")
+    parser.add_argument("--batch-size", type=int, default=settings.AVAILABILITY_SCAN_BATCH_SIZE)
+    args = parser.parse_args()
+    if args.users > 50_000_000:
+        parser.error("--users is limited to 50M (phones are +225 followed by 8 digits, even numbers only)")
+
+    email_every = round(1 / args.email_share) if args.email_share > 0 else 0
+    emails = len(range(0, args.users, email_every)) if email_every else 0
+    keys = args.users + emails
+    capacity = max(settings.AVAILABILITY_MIN_CAPACITY, int(keys * settings.AVAILABILITY_HEADROOM))
+    bloom = BloomFilter(capacity, settings.AVAILABILITY_FALSE_POSITIVE_RATE)
+    print(f"{args.users} users, {emails} with an email: {keys} keys")
+    print(f"  capacity {capacity} keys, {bloom.hashes} hashes, target false-positive rate "
+          f"{settings.AVAILABILITY_FALSE_POSITIVE_RATE:.2%} (at capacity)")
+
+    started = time.perf_counter()
+    for start in range(0, args.users, args.batch_size):
+        bloom.add_many(user_keys(start, min(start + args.batch_size, args.users), email_every))
+    build = time.perf_counter() - started
+    print(f"  build       {build:8.1f} s  ({build * 1e6 / keys:.2f} us/key)")
+
+    size = len(bloom.bits)
+    sample = user_keys(0, min(args.users, 100_000), email_every)
+    print(f"  filter      {size / 2**20:8.1f} MiB ({size * 8 / keys:.1f} bits/key)")
+    print(f"  python set  {set_bytes_per_key(sample) * keys / 2**20:8.1f} MiB (estimated, for comparison)")
+
+    probes = [phone_key(f"+225{2 * i + 1:08d}") for i in range(args.probes)]
+    probes += [email_key(f"probe{i}@example.com") for i in range(args.probes)]
+    started = time.perf_counter()
+    hits = sum(key in bloom for key in probes)
+    check = time.perf_counter() - started
+    print(f"  false pos.  {hits / len(probes):8.3%}    ({hits} of {len(probes)} unregistered values would query the DB)")
+    print(f"  check       {check * 1e6 / len(probes):8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
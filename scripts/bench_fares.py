@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched fare quotes (app/core/fares.py).
+
+Times a batch of random origin/destination pairs through:
+  - loop   : one pair at a time in pure Python (what one request per quote amounts to, minus HTTP)
+  - numpy  : fares.quote, vectorized over the memory-mapped route table
+
+Usage:
+  cd backend
+  python scripts/bench_fares.py                    # batches of 1000, route table from ROUTE_TABLE_DIR
+  python scripts/bench_fares.py --batch 5000 --runs 50
+
+Needs the route table (python scripts/build_route_table.py) and the same .env as the app.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_ROOT)
+
+from app.core import fares  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.models.user import UserRole  # noqa: E402
+
+
+def quote_loop(table: fares.RouteTable, pairs, role: UserRole) -> list:
+    pricing = settings.FARE_PRICING[role.value]
+    rounding = settings.FARE_ROUNDING
+    prices = []
+    for origin, destination in pairs:
+        i = table.index.get(fares.normalize_stop(origin))
+        j = table.index.get(fares.normalize_stop(destination))
+        if i is None or j is None or i == j:
+            prices.append(-1)
+            continue
+        raw = max(pricing["minimum"], pricing["base"] + pricing["per_km"] * float(table.distances[i, j]))
+        prices.append(int(round(raw / rounding) * rounding))
+    return prices
+
+
+def timed(fn, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=1000, help="Pairs per batch (default 1000)")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    table = fares.get_route_table()
+    role = UserRole.DRIVER_COMPANY
+    pairs = [(random.choice(table.stops), random.choice(table.stops)) for _ in range(args.batch)]
+
+    expected = quote_loop(table, pairs, role)
+    if fares.quote(pairs, role).price.tolist() != expected:
+        sys.exit("Vectorized prices differ from the loop")
+
+    print(f"{args.batch} pairs over {len(table.stops)} stops, {args.runs} runs (ms)")
+    for name, fn in (
+        ("loop", lambda: quote_loop(table, pairs, role)),
+        ("numpy", lambda: fares.quote(pairs, role)),
+    ):
+        samples = timed(fn, args.runs)
+        print(f"  {name:<7} median {statistics.median(samples):8.3f}   min {min(samples):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
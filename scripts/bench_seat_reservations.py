@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test of seat reservations on a single popular departure.
+
+Creates a throwaway company, vehicle and trip, then has many clients race to hold seats on
+that trip at the same time through ``app.crud.trip.hold_seats`` (each client in its own
+thread, session and DB connection). Modes:
+
+  - any      : each client asks for N free seats (claimed with FOR UPDATE SKIP LOCKED)
+  - specific : each client asks for N random seat numbers (per-seat compare-and-set)
+
+It reports hold latency percentiles, successes/conflicts, and checks from the database that
+no seat was handed out twice and that no more seats were sold than the trip has (exits 1
+otherwise). Everything it creates is deleted afterwards.
+
+Usage:
+  cd backend
+  python scripts/bench_seat_reservations.py                            # 300 clients, 50 seats
+  python scripts/bench_seat_reservations.py --clients 1000 --seats 70 --per-client 2 --mode specific
+
+Needs the same .env as the app, pointing at a migrated Postgres database.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_ROOT)
+
+from sqlalchemy import create_engine, func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.crud import trip as crud_trip  # noqa: E402
+from app.models import Company, Reservation, TripSeat, User, UserRole, Vehicle  # noqa: E402
+from app.schemas.trip import TripCreate  # noqa: E402
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def setup(Session, seats: int, clients: int, tag: str):
+    """Owner, company, vehicle, trip and client users; returns (owner id, trip id, client ids)."""
+    with Session() as db:
+        owner = User(phone=f"{tag}-owner", hashed_password="-", role=UserRole.DRIVER_COMPANY)
+        db.add(owner)
+        db.flush()
+        company = Company(owner_id=owner.id, name=f"Bench {tag}")
+        db.add(company)
+        db.flush()
+        vehicle = Vehicle(company_id=company.id, plate_number=tag, seats=seats)
+        db.add(vehicle)
+        db.flush()
+        client_ids = [uuid.uuid4() for _ in range(clients)]
+        db.execute(
+            insert(User),
+            [
+                {"id": client_id, "phone": f"{tag}-{i}", "hashed_password": "-", "role": UserRole.CLIENT}
+                for i, client_id in enumerate(client_ids)
+            ],
+        )
+        db.commit()
+        trip_in = TripCreate(
+            vehicle_id=vehicle.id,
+            origin="Abidjan",
+            destination=f"Bench {tag}",
+            departure_at=datetime.now(timezone.utc) + timedelta(days=1),
+            price=5000,
+        )
+        trip = crud_trip.create_trip(db, company.id, trip_in, seats_total=seats)
+        return owner.id, trip.id, client_ids
+
+
+def teardown(Session, owner_id, tag: str) -> None:
+    with Session() as db:
+        db.query(User).filter(User.id == owner_id).delete(synchronize_session=False)  # Cascades to the trip
+        db.query(User).filter(User.phone.like(f"{tag}-%")).delete(synchronize_session=False)
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=300, help="Concurrent clients (default 300)")
+    parser.add_argument("--seats", type=int, default=50, help="Seats on the trip (default 50)")
+    parser.add_argument("--per-client", type=int, default=1, help="Seats each client asks for (default 1)")
+    parser.add_argument("--mode", choices=("any", "specific"), default="any")
+    parser.add_argument("--connections", type=int, default=50, help="DB connections / threads (default 50)")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL, pool_size=args.connections, max_overflow=0)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    owner_id, trip_id, client_ids = setup(Session, args.seats, args.clients, tag)
+
+    latencies = []
+    held = []
+    conflicts = 0
+    lock = threading.Lock()
+    start = threading.Barrier(min(args.connections, args.clients))
+
+    def book(client_id):
+        nonlocal conflicts
+        with Session() as db:
+            trip = crud_trip.get_trip(db, trip_id)
+            db.commit()
+            try:
+                start.wait(timeout=5)  # Release the first wave together
+            except threading.BrokenBarrierError:
+                pass
+            if args.mode == "any":
+                kwargs = {"seats": args.per_client}
+            else:
+                kwargs = {"seat_numbers": random.sample(range(1, args.seats + 1), args.per_client)}
+            started = time.perf_counter()
+            reservation, seat_numbers = crud_trip.hold_seats(db, trip, client_id, **kwargs)
+            elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if reservation is None:
+                conflicts += 1
+            else:
+                held.append(seat_numbers)
+
+    try:
+        wall = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.connections) as pool:
+            list(pool.map(book, client_ids))
+        wall = time.perf_counter() - wall
+
+        with Session() as db:
+            rows = db.execute(
+                select(func.count(), func.count(func.distinct(TripSeat.reservation_id)))
+                .where(TripSeat.trip_id == trip_id, TripSeat.reservation_id.isnot(None))
+            ).one()
+            reservations = db.scalar(select(func.count()).where(Reservation.trip_id == trip_id))
+    finally:
+        teardown(Session, owner_id, tag)
+
+    seats_claimed = sum(len(seats) for seats in held)
+    distinct_seats = len({seat for seats in held for seat in seats})
+    ms = [latency * 1000 for latency in latencies]
+    print(f"{args.clients} clients x {args.per_client} seat(s), {args.seats} seats, mode={args.mode}, "
+          f"{args.connections} connections")
+    print(f"  holds: {len(held)} ok, {conflicts} conflicts in {wall:.2f}s")
+    print(f"  latency ms: p50 {percentile(ms, 50):.1f}  p95 {percentile(ms, 95):.1f}  "
+          f"p99 {percentile(ms, 99):.1f}  max {max(ms):.1f}  stdev {statistics.pstdev(ms):.1f}")
+    print(f"  seats claimed: {seats_claimed} (distinct {distinct_seats}); in DB: {rows[0]} seats held by "
+          f"{rows[1]} reservations, {reservations} reservation rows")
+
+    oversold = seats_claimed > args.seats or distinct_seats != seats_claimed or rows[0] != seats_claimed
+    if oversold or reservations != len(held):
+        print("FAIL: seats were handed out twice or counts disagree")
+        sys.exit(1)
+    print("OK: no seat sold twice")
+
+
+if __name__ == "__main__":
+    main()
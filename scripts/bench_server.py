@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory and throughput of the server setups.
+
+Compares:
+  - single   : uvicorn main:app                     (one process, one event loop)
+  - naive    : uvicorn main:app --workers N         (N workers, each imports the app itself)
+  - prod     : gunicorn main:app  (gunicorn.conf.py: N preloaded, forked workers)
+
+For each setup it reports the total RSS and PSS of the process tree (PSS splits shared
+copy-on-write pages between the processes sharing them, so it shows what preloading saves)
+and requests/second against a path (default /health) from a pool of keep-alive clients.
+
+Usage:
+  cd backend
+  python scripts/bench_server.py                       # N = available CPUs
+  python scripts/bench_server.py --workers 4 --duration 20 --path /api/v1/users/me
+
+Needs the same .env as the app (main.py connects to the DB on import). Linux only (/proc).
+"""
+import argparse
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def children(pid: int) -> list:
+    """All descendants of pid (via /proc/<pid>/task/*/children)."""
+    found = []
+    stack = [pid]
+    while stack:
+        p = stack.pop()
+        try:
+            for task in os.listdir(f"/proc/{p}/task"):
+                with open(f"/proc/{p}/task/{task}/children") as f:
+                    kids = [int(c) for c in f.read().split()]
+                found.extend(kids)
+                stack.extend(kids)
+        except OSError:
+            continue
+    return found
+
+
+def memory_kb(pid: int) -> tuple:
+    """(rss, pss) in kB for a single process."""
+    rss = pss = 0
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Rss:"):
+                    rss = int(line.split()[1])
+                elif line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def tree_memory_mb(pid: int) -> tuple:
+    procs = [pid] + children(pid)
+    rss = pss = 0
+    for p in procs:
+        r, s = memory_kb(p)
+        rss += r
+        pss += s
+    return len(procs), rss / 1024, pss / 1024
+
+
+def wait_ready(port: int, path: str, timeout: float = 60) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.3)
+    return False
+
+
+def load(port: int, path: str, concurrency: int, duration: float) -> tuple:
+    """Hammer path with keep-alive clients; returns (requests, errors)."""
+    deadline = time.time() + duration
+
+    def client(_):
+        ok = err = 0
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        while time.time() < deadline:
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status < 500:
+                    ok += 1
+                else:
+                    err += 1
+            except (OSError, http.client.HTTPException):
+                err += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.close()
+        return ok, err
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(client, range(concurrency)))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def run(name: str, cmd: list, port: int, args) -> dict:
+    env = dict(os.environ)
+    # uvicorn also reads WEB_CONCURRENCY, so only the gunicorn setup gets it
+    env.pop("WEB_CONCURRENCY", None)
+    if name == "prod":
+        env["WEB_CONCURRENCY"] = str(args.workers)
+    proc = subprocess.Popen(
+        cmd, cwd=BACKEND_ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+    )
+    try:
+        if not wait_ready(port, args.path):
+            print(f"  [{name}] server did not start")
+            return {}
+        time.sleep(args.warmup)  # let every worker finish booting
+        n_procs, rss_idle, pss_idle = tree_memory_mb(proc.pid)
+        requests_done, errors = load(port, args.path, args.concurrency, args.duration)
+        _, rss_load, pss_load = tree_memory_mb(proc.pid)
+        return {
+            "name": name,
+            "procs": n_procs,
+            "rss_idle": rss_idle,
+            "pss_idle": pss_idle,
+            "rss_load": rss_load,
+            "pss_load": pss_load,
+            "rps": requests_done / args.duration,
+            "errors": errors,
+        }
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+
+
+def main():
+    try:
+        default_workers = len(os.sched_getaffinity(0))
+    except AttributeError:
+        default_workers = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=default_workers)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    py = sys.executable
+    setups = [
+        ("single", [py, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"]),
+        ("naive", [py, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning",
+                   "--workers", str(args.workers)]),
+        ("prod", [py, "-m", "gunicorn", "main:app", "--bind", f"127.0.0.1:{args.port}",
+                  "--access-logfile", "/dev/null"]),
+    ]
+
+    print(f"workers={args.workers} concurrency={args.concurrency} duration={args.duration}s path={args.path}\n")
+    results = [r for r in (run(name, cmd, args.port, args) for name, cmd in setups) if r]
+
+    print(f"{'setup':<8} {'procs':>5} {'RSS idle':>10} {'PSS idle':>10} {'RSS load':>10} {'PSS load':>10} {'req/s':>10} {'errors':>7}")
+    for r in results:
+        print(
+            f"{r['name']:<8} {r['procs']:>5} {r['rss_idle']:>8.1f}MB {r['pss_idle']:>8.1f}MB "
+            f"{r['rss_load']:>8.1f}MB {r['pss_load']:>8.1f}MB {r['rps']:>10.0f} {r['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
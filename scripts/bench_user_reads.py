@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compare the ORM and the column-projected read paths for large user listings.
+
+For a page of N users, measures query + serialization to JSON bytes:
+  - orm        : db.query(User) instances, serialized the way FastAPI encodes a response_model
+                 (validate from attributes, dump to JSON-able Python, json.dumps)
+  - projected  : crud.user.get_user_records rows (public columns only), dumped by pydantic
+                 straight to JSON bytes, as GET /api/v1/users/ does
+
+It reports CPU time per row and the peak Python memory allocated (tracemalloc) per run.
+Throwaway users are inserted first (and deleted afterwards) so the table has at least N rows.
+
+Usage:
+  cd backend
+  python scripts/bench_user_reads.py                   # 5000 rows
+  python scripts/bench_user_reads.py --rows 20000 --runs 5
+
+Needs the same .env as the app, pointing at a migrated database.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from typing import List
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_ROOT)
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.crud import user as crud_user  # noqa: E402
+from app.models import User, UserRole  # noqa: E402
+from app.schemas.user import UserOut  # noqa: E402
+
+users_adapter = TypeAdapter(List[UserOut])
+
+
+def read_orm(db, rows: int) -> bytes:
+    users = db.query(User).order_by(User.id).limit(rows).all()
+    content = users_adapter.dump_python(users_adapter.validate_python(users, from_attributes=True), mode="json")
+    return json.dumps(content).encode()
+
+
+def read_projected(db, rows: int) -> bytes:
+    users = crud_user.get_user_records(db, limit=rows)
+    return users_adapter.dump_json(users_adapter.validate_python(users, from_attributes=True))
+
+
+def measure(fn, rows: int, runs: int):
+    """Median CPU seconds and peak traced bytes (measured in separate runs, tracing slows things)."""
+    cpu, peaks = [], []
+    for traced in [False] * runs + [True] * runs:
+        with SessionLocal() as db:
+            if traced:
+                tracemalloc.start()
+            started = time.process_time()
+            body = fn(db, rows)
+            if traced:
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            else:
+                cpu.append(time.process_time() - started)
+    return statistics.median(cpu), statistics.median(peaks), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    with SessionLocal() as db:
+        missing = max(0, args.rows - db.scalar(select(func.count()).select_from(User)))
+        if missing:
+            db.execute(
+                insert(User),
+                [
+                    {"id": uuid.uuid4(), "phone": f"{tag}-{i}", "hashed_password": "$2b$12$" + "x" * 53,
+                     "full_name": f"Bench user {i}", "role": UserRole.CLIENT}
+                    for i in range(missing)
+                ],
+            )
+            db.commit()
+
+    try:
+        measure(read_projected, args.rows, 1)  # Warm up (imports, compiled statements)
+        print(f"{args.rows} rows, median of {args.runs} runs")
+        results = {}
+        for name, fn in (("orm", read_orm), ("projected", read_projected)):
+            cpu, peak, size = measure(fn, args.rows, args.runs)
+            results[name] = (cpu, peak)
+            print(f"  {name:<10} {cpu * 1e6 / args.rows:7.1f} us/row CPU   "
+                  f"{peak / args.rows:8.0f} B/row peak   ({size} bytes of JSON)")
+        orm, projected = results["orm"], results["projected"]
+        print(f"  projected uses {projected[0] / orm[0]:.0%} of the CPU and {projected[1] / orm[1]:.0%} of the memory")
+    finally:
+        if missing:
+            with SessionLocal() as db:
+                db.query(User).filter(User.phone.like(f"{tag}-%")).delete(synchronize_session=False)
+                db.commit()
+
+
+if __name__ == "__main__":
+    main()
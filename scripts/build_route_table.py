@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Build the route table used for fare quotes (app/core/fares.py).
+
+Reads stops (name, latitude, longitude) from a CSV and writes to the output directory:
+  - stops.json     : stop names, in matrix order
+  - distances.npy  : float32 N x N road distance matrix in km, memory-mapped by the app
+
+Distances are great-circle distances times --road-factor, unless a measured road distance
+is given for the pair in --distances (CSV: origin,destination,km; applied both ways).
+
+Usage:
+  cd backend
+  python scripts/build_route_table.py                                  # data/stops.csv -> data/route_table
+  python scripts/build_route_table.py --stops stops.csv --distances roads.csv --out /srv/route_table
+
+Restart the server (./scripts/reload_server.sh) to pick up a new table.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EARTH_RADIUS_KM = 6371.0
+
+
+def great_circle_km(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """N x N haversine distances between all stops."""
+    lat = np.radians(lat)[:, None]
+    lon = np.radians(lon)[:, None]
+    dlat = lat - lat.T
+    dlon = lon - lon.T
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stops", default=os.path.join(BACKEND_ROOT, "data", "stops.csv"))
+    parser.add_argument("--distances", help="CSV of measured road distances: origin,destination,km")
+    parser.add_argument("--road-factor", type=float, default=1.3, help="Road km per great-circle km (default 1.3)")
+    parser.add_argument("--out", default=os.path.join(BACKEND_ROOT, "data", "route_table"))
+    args = parser.parse_args()
+
+    with open(args.stops, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    names = [row["name"].strip() for row in rows]
+    if len(set(name.casefold() for name in names)) != len(names):
+        sys.exit("Duplicate stop names in " + args.stops)
+    lat = np.array([float(row["latitude"]) for row in rows])
+    lon = np.array([float(row["longitude"]) for row in rows])
+
+    distances = great_circle_km(lat, lon) * args.road_factor
+    if args.distances:
+        index = {name.casefold(): i for i, name in enumerate(names)}
+        with open(args.distances, newline="", encoding="utf-8") as f:
+            for origin, destination, km in csv.reader(f):
+                if origin == "origin":
+                    continue  # Header
+                try:
+                    i, j = index[origin.strip().casefold()], index[destination.strip().casefold()]
+                except KeyError as exc:
+                    sys.exit(f"Unknown stop in {args.distances}: {exc}")
+                distances[i, j] = distances[j, i] = float(km)
+
+    os.makedirs(args.out, exist_ok=True)
+    # Write next to the target and rename, so a running server never maps a half-written file
+    tmp = os.path.join(args.out, "distances.tmp.npy")
+    np.save(tmp, distances.astype(np.float32))
+    os.replace(tmp, os.path.join(args.out, "distances.npy"))
+    with open(os.path.join(args.out, "stops.json.tmp"), "w", encoding="utf-8") as f:
+        json.dump(names, f, ensure_ascii=False, indent=0)
+    os.replace(os.path.join(args.out, "stops.json.tmp"), os.path.join(args.out, "stops.json"))
+    print(f"Wrote {len(names)} stops ({distances.nbytes // 2} bytes of distances) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
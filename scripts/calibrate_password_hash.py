@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Pick password-hash costs for this host from a target login latency.
+
+Times one hash at increasing cost and keeps the highest cost whose median stays within the
+target:
+  - bcrypt : rounds (log2 work factor) from 10 up
+  - argon2 : time_cost from 1 up, at a fixed memory and parallelism (argon2id, needs argon2-cffi)
+
+Run it where the API runs (same CPU type and container CPU limit). Put the printed settings
+in .env. Existing hashes keep working and are rehashed with the new cost at each user's next
+successful login.
+
+Usage:
+  cd backend
+  python scripts/calibrate_password_hash.py                        # bcrypt, 250 ms
+  python scripts/calibrate_password_hash.py --target-ms 150
+  python scripts/calibrate_password_hash.py --scheme argon2 --memory-kib 65536 --parallelism 2
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from passlib.hash import argon2, bcrypt
+
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 20
+MAX_ARGON2_TIME_COST = 20
+
+
+def median_ms(handler, runs: int) -> float:
+    handler.hash("calibration")  # Warm up (backend loading)
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        handler.hash("calibration-password")
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def calibrate(candidates, target_ms: float, runs: int):
+    """(cost, ms) of the highest candidate within target_ms, or None; costs are tried in order."""
+    best = None
+    for cost, handler in candidates:
+        ms = median_ms(handler, runs)
+        print(f"  {cost:<24} {ms:8.1f} ms")
+        if ms > target_ms:
+            break
+        best = (cost, ms)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scheme", choices=("bcrypt", "argon2"), default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Latency budget of one hash")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--memory-kib", type=int, default=64 * 1024, help="argon2 memory per hash")
+    parser.add_argument("--parallelism", type=int, default=2, help="argon2 lanes")
+    args = parser.parse_args()
+
+    print(f"{args.scheme}, target {args.target_ms:g} ms, median of {args.runs}")
+    if args.scheme == "bcrypt":
+        candidates = (
+            (f"rounds={rounds}", bcrypt.using(rounds=rounds))
+            for rounds in range(MIN_BCRYPT_ROUNDS, MAX_BCRYPT_ROUNDS + 1)
+        )
+    else:
+        if not argon2.has_backend():
+            sys.exit("argon2 needs the argon2-cffi package")
+        candidates = (
+            (f"time_cost={time_cost}", argon2.using(
+                time_cost=time_cost, memory_cost=args.memory_kib, parallelism=args.parallelism
+            ))
+            for time_cost in range(1, MAX_ARGON2_TIME_COST + 1)
+        )
+
+    best = calibrate(candidates, args.target_ms, args.runs)
+    if best is None:
+        minimum = f"rounds={MIN_BCRYPT_ROUNDS}" if args.scheme == "bcrypt" else "time_cost=1"
+        hint = "" if args.scheme == "bcrypt" else " or lower --memory-kib"
+        sys.exit(f"Even {minimum} is over {args.target_ms:g} ms on this host: raise --target-ms{hint}")
+
+    cost, ms = best
+    print(f"\n# {ms:.0f} ms per hash on this host")
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    if args.scheme == "bcrypt":
+        print(f"PASSWORD_BCRYPT_ROUNDS={cost.split('=')[1]}")
+    else:
+        print(f"PASSWORD_ARGON2_TIME_COST={cost.split('=')[1]}")
+        print(f"PASSWORD_ARGON2_MEMORY_KIB={args.memory_kib}")
+        print(f"PASSWORD_ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
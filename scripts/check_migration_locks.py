@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Dry run of Alembic migrations: report which statements take heavy locks.
+
+Renders the migrations as SQL (alembic offline mode, nothing is executed) and classifies every
+statement by the lock it takes on existing tables:
+  ok     - reads and writes continue (CONCURRENTLY, VALIDATE, batched backfills, ...)
+  brief  - ACCESS EXCLUSIVE for a catalog-only change; fine behind set_lock_timeout()
+  HEAVY  - blocks writes (or reads) for a scan/rewrite/index build, or destroys data
+
+Usage:
+  cd backend
+  python scripts/check_migration_locks.py               # every migration (base:head)
+  python scripts/check_migration_locks.py 003:head      # only migrations after 003
+
+Exits with status 1 if any HEAVY statement is found, so it can gate CI.
+Only needs DATABASE_URL to point at a PostgreSQL URL (no connection is made).
+"""
+import argparse
+import io
+import os
+import sys
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_ROOT)
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+from app.core.online_migrations import lock_report  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("revisions", nargs="?", default="base:head", help="start:end revision range")
+    parser.add_argument("--all", action="store_true", help="also list statements classified ok/brief")
+    args = parser.parse_args()
+
+    buffer = io.StringIO()
+    config = Config(os.path.join(BACKEND_ROOT, "alembic.ini"), output_buffer=buffer)
+    config.set_main_option("script_location", os.path.join(BACKEND_ROOT, "alembic"))
+    command.upgrade(config, args.revisions, sql=True)
+
+    findings = lock_report(buffer.getvalue())
+    heavy = [f for f in findings if f.level == "HEAVY"]
+    for finding in findings if args.all else [f for f in findings if f.level != "ok"]:
+        statement = " ".join(finding.statement.split())
+        if len(statement) > 100:
+            statement = statement[:97] + "..."
+        print(f"[{finding.level:<5}] {finding.lock:<22} {statement}")
+        print(f"        {finding.reason}")
+
+    print(f"\n{len(findings)} locking statements: {len(heavy)} heavy, "
+          f"{sum(f.level == 'brief' for f in findings)} brief, {sum(f.level == 'ok' for f in findings)} ok")
+    sys.exit(1 if heavy else 0)
+
+
+if __name__ == "__main__":
+    main()
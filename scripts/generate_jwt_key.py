@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Generate a P-256 key pair for ES256 access tokens.
+
+Usage:
+  cd backend
+  python scripts/generate_jwt_key.py keys/              # kid defaults to today's date, e.g. 2026-10-19
+  python scripts/generate_jwt_key.py keys/ --kid 2026-q4
+
+Writes <dir>/<kid>.pem (private key, mode 600). Distribute it to every instance, then set
+JWT_ACTIVE_KID=<kid> (see README, "Token signing keys").
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("keys_dir")
+    parser.add_argument("--kid", default=date.today().isoformat())
+    args = parser.parse_args()
+
+    path = os.path.join(args.keys_dir, f"{args.kid}.pem")
+    if os.path.exists(path):
+        print(f"Error: {path} already exists")
+        sys.exit(1)
+    os.makedirs(args.keys_dir, exist_ok=True)
+
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    print(f"Wrote {path} (kid={args.kid})")
+
+
+if __name__ == "__main__":
+    main()
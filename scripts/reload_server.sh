@@ -0,0 +1,65 @@
+#!/usr/bin/env bash
+# Zero-downtime restart of the production server started with start_prod_server.sh.
+# Usage: ./scripts/reload_server.sh   (from backend/) or  ./reload_server.sh (from backend/scripts/)
+#
+# The app is preloaded in the gunicorn master, so a plain HUP would not pick up new code.
+# Instead: USR2 starts a new master (re-importing the app) next to the old one, then the old
+# master is told to shut down gracefully (TERM) once the new one is serving: its workers finish
+# their in-flight requests first (QUIT would stop them immediately and drop those requests).
+# "Serving" means the new master has forked as many workers as the old one runs (WORKERS to
+# override) and /health/ready answers 200 on the bind address (HEALTH_URL to override).
+
+set -e
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+BACKEND_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+cd "$BACKEND_ROOT"
+
+PIDFILE="${PIDFILE:-$BACKEND_ROOT/gunicorn.pid}"
+WAIT="${WAIT:-30}"
+HEALTH_URL="${HEALTH_URL:-http://127.0.0.1:${PORT:-8000}/health/ready}"
+
+if [[ ! -f "$PIDFILE" ]]; then
+  echo "No pidfile at $PIDFILE. Is the server running (./scripts/start_prod_server.sh)?"
+  exit 1
+fi
+
+OLD_PID=$(cat "$PIDFILE")
+WORKERS="${WORKERS:-$(pgrep -P "$OLD_PID" | wc -l)}"
+echo "Starting new master next to $OLD_PID..."
+kill -USR2 "$OLD_PID"
+
+# The new master writes its pid to <pidfile>.2, and moves it to <pidfile> once the old one is gone
+for _ in $(seq "$WAIT"); do
+  if [[ -s "$PIDFILE.2" ]]; then
+    break
+  fi
+  sleep 1
+done
+
+NEW_PID=$(cat "$PIDFILE.2" 2>/dev/null || true)
+if [[ -z "$NEW_PID" ]]; then
+  echo "New master did not come up within ${WAIT}s; old master $OLD_PID keeps serving."
+  exit 1
+fi
+
+# The pidfile is written before the workers boot: wait for them, then for the app to answer
+echo "New master $NEW_PID is up, waiting for its $WORKERS workers..."
+SERVING=""
+for _ in $(seq "$WAIT"); do
+  if [[ "$(pgrep -P "$NEW_PID" | wc -l)" -ge "$WORKERS" ]] \
+    && curl -fsS -o /dev/null --max-time 2 "$HEALTH_URL"; then
+    SERVING=1
+    break
+  fi
+  sleep 1
+done
+
+if [[ -z "$SERVING" ]]; then
+  echo "New master $NEW_PID is not serving after ${WAIT}s; old master $OLD_PID keeps serving."
+  echo "Stop the new one with: kill -TERM $NEW_PID"
+  exit 1
+fi
+
+echo "New master $NEW_PID is serving. Draining old master $OLD_PID..."
+kill -TERM "$OLD_PID"
+echo "Done."
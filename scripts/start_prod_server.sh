@@ -0,0 +1,25 @@
+#!/usr/bin/env bash
+# Start the production server: gunicorn master + preloaded uvicorn workers (see gunicorn.conf.py).
+# Usage: ./scripts/start_prod_server.sh   (from backend/) or  ./start_prod_server.sh (from backend/scripts/)
+# Worker count defaults to the available CPUs; override with WEB_CONCURRENCY=4.
+
+set -e
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+BACKEND_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+cd "$BACKEND_ROOT"
+
+PORT="${PORT:-8000}"
+HOST="${HOST:-0.0.0.0}"
+PIDFILE="${PIDFILE:-$BACKEND_ROOT/gunicorn.pid}"
+
+if [[ ! -d "venv" ]]; then
+  echo "Error: venv not found. Create it with: python3 -m venv venv && venv/bin/pip install -r requirements.txt"
+  exit 1
+fi
+
+echo "Starting server at http://${HOST}:${PORT} (pidfile: $PIDFILE)"
+echo "Logs below (Ctrl+C to stop, ./scripts/reload_server.sh for a rolling restart)."
+echo "---"
+# The gunicorn script, not "python -m gunicorn": reload_server.sh re-executes this command line,
+# and run as a file gunicorn/__main__.py would put gunicorn's own "app" package ahead of ours
+exec venv/bin/gunicorn main:app --bind "$HOST:$PORT" --pid "$PIDFILE"
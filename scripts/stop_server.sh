@@ -1,5 +1,5 @@
 #!/usr/bin/env bash
-# Stop the FastAPI backend server (process listening on port 8000, or uvicorn main:app).
+# Stop the FastAPI backend server (process listening on port 8000, or uvicorn/gunicorn main:app).
 # Usage: ./scripts/stop_server.sh   (from backend/) or  ./stop_server.sh (from backend/scripts/)
 
 set -e
@@ -19,12 +19,12 @@ else
 fi
 
 if [[ -z "$PIDS" ]]; then
-  # Fallback: find uvicorn process running main:app
-  PIDS=$(pgrep -f "uvicorn main:app" 2>/dev/null || true)
+  # Fallback: find uvicorn/gunicorn process running main:app
+  PIDS=$(pgrep -f "(uvicorn|gunicorn) main:app" 2>/dev/null || true)
 fi
 
 if [[ -z "$PIDS" ]]; then
-  echo "No server found on port $PORT or running uvicorn main:app."
+  echo "No server found on port $PORT or running uvicorn/gunicorn main:app."
   exit 0
 fi
 
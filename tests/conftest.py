@@ -0,0 +1,32 @@
+"""
+Unit tests: no PostgreSQL or server needed.
+
+Settings are read when ``app`` is imported, so the environment is set first: a throwaway
+SQLite file stands in for the database. Only tables with portable column types can be created
+there (``create_tables``); the Postgres-specific ones (UUID keys) are not used by these tests.
+"""
+import os
+import tempfile
+
+import pytest
+
+_db_dir = tempfile.mkdtemp(prefix="waren-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["SECRET_KEY"] = "test-secret-key"
+
+from app.core.database import engine  # noqa: E402
+
+
+@pytest.fixture
+def create_tables():
+    """Create the given models' tables for one test, and drop them afterwards."""
+    tables = []
+
+    def create(*models):
+        for model in models:
+            model.__table__.create(engine, checkfirst=True)
+            tables.append(model.__table__)
+
+    yield create
+    for table in reversed(tables):
+        table.drop(engine, checkfirst=True)
@@ -0,0 +1,68 @@
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+BIG = "x" * 4096
+
+
+def make_client():
+    app = Starlette(routes=[
+        Route("/big", lambda request: PlainTextResponse(BIG)),
+        Route("/small", lambda request: JSONResponse({"ok": True})),
+        Route("/no-transform", lambda request: PlainTextResponse(BIG, headers={"Cache-Control": "no-transform"})),
+        Route("/binary", lambda request: PlainTextResponse(BIG, media_type="application/octet-stream")),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("*", "br"),
+    ("identity", None),
+    ("br;q=0, gzip;q=0", None),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_large_response_is_compressed_with_vary():
+    response = make_client().get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == BIG
+
+
+@pytest.mark.parametrize("path, accept_encoding", [
+    ("/small", "gzip"),         # Below the size threshold
+    ("/big", "identity"),       # Client accepts no supported encoding
+])
+def test_uncompressed_variants_still_vary_on_accept_encoding(path, accept_encoding):
+    response = make_client().get(path, headers={"Accept-Encoding": accept_encoding})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_no_transform_response_is_not_compressed():
+    response = make_client().get("/no-transform", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+    assert response.text == BIG
+
+
+def test_incompressible_type_is_left_alone():
+    response = make_client().get("/binary", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
@@ -0,0 +1,168 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.core.database import engine
+from app.core.idempotency import IdempotencyMiddleware, IdempotencyStore
+from app.models.idempotency import IdempotencyKey
+
+
+@pytest.fixture
+def store(create_tables):
+    create_tables(IdempotencyKey)
+    return IdempotencyStore(ttl_seconds=60, lease_seconds=60, purge_interval=60)
+
+
+def make_endpoint(statuses=(201,), gate=None):
+    """ASGI app answering {"call": n}; the n-th call gets statuses[n-1] (the last one after that)."""
+    calls = []
+
+    async def endpoint(scope, receive, send):
+        calls.append((await receive())["body"])
+        if gate is not None:
+            await gate.wait()
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"call":%d}' % len(calls)})
+
+    endpoint.calls = calls
+    return endpoint
+
+
+async def post(app, key="key-1", body=b'{"phone":"+22507000001"}', authorization="Bearer a"):
+    headers = {"Authorization": authorization}
+    if key is not None:
+        headers["Idempotency-Key"] = key
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await client.post("/api/v1/auth/register", content=body, headers=headers)
+
+
+def test_retry_on_another_worker_replays_the_first_response(store):
+    endpoint = make_endpoint()
+    worker_1, worker_2 = IdempotencyMiddleware(endpoint, store), IdempotencyMiddleware(endpoint, store)
+
+    first = asyncio.run(post(worker_1))
+    retry = asyncio.run(post(worker_2))
+
+    assert (first.status_code, first.json()) == (201, {"call": 1})
+    assert (retry.status_code, retry.json()) == (201, {"call": 1})
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert len(endpoint.calls) == 1
+
+
+def test_key_is_scoped_by_authorization(store):
+    endpoint = make_endpoint()
+    app = IdempotencyMiddleware(endpoint, store)
+
+    asyncio.run(post(app, authorization="Bearer a"))
+    other = asyncio.run(post(app, authorization="Bearer b"))
+
+    assert other.json() == {"call": 2}
+    assert len(endpoint.calls) == 2
+
+
+def test_reused_key_with_another_body_is_rejected(store):
+    endpoint = make_endpoint()
+    app = IdempotencyMiddleware(endpoint, store)
+
+    asyncio.run(post(app, body=b'{"phone":"+22507000001"}'))
+    reused = asyncio.run(post(app, body=b'{"phone":"+22507000002"}'))
+
+    assert reused.status_code == 422
+    assert len(endpoint.calls) == 1
+
+
+def test_concurrent_duplicate_waits_for_the_original(store):
+    async def run():
+        gate = asyncio.Event()
+        endpoint = make_endpoint(gate=gate)
+        worker_1, worker_2 = IdempotencyMiddleware(endpoint, store), IdempotencyMiddleware(endpoint, store)
+        original = asyncio.create_task(post(worker_1))
+        while not endpoint.calls:
+            await asyncio.sleep(0.01)
+        duplicate = asyncio.create_task(post(worker_2))
+        await asyncio.sleep(0.2)  # The duplicate is polling the in-flight claim by now
+        gate.set()
+        return endpoint, await original, await duplicate
+
+    endpoint, original, duplicate = asyncio.run(run())
+
+    assert len(endpoint.calls) == 1
+    assert original.json() == duplicate.json() == {"call": 1}
+    assert duplicate.headers["idempotent-replayed"] == "true"
+
+
+def test_duplicate_gives_up_after_the_wait(store, monkeypatch):
+    monkeypatch.setattr("app.core.idempotency.settings.IDEMPOTENCY_WAIT_SECONDS", 0)
+
+    async def run():
+        gate = asyncio.Event()
+        endpoint = make_endpoint(gate=gate)
+        app = IdempotencyMiddleware(endpoint, store)
+        original = asyncio.create_task(post(app))
+        while not endpoint.calls:
+            await asyncio.sleep(0.01)
+        duplicate = await post(app)
+        gate.set()
+        await original
+        return duplicate
+
+    assert asyncio.run(run()).status_code == 409
+
+
+def test_server_errors_are_not_stored(store):
+    endpoint = make_endpoint(statuses=(500, 201))
+    app = IdempotencyMiddleware(endpoint, store)
+
+    failed = asyncio.run(post(app))
+    retry = asyncio.run(post(app))
+
+    assert failed.status_code == 500
+    assert (retry.status_code, retry.json()) == (201, {"call": 2})
+    assert "idempotent-replayed" not in retry.headers
+
+
+def test_abandoned_claim_is_taken_over_after_its_lease(store):
+    endpoint = make_endpoint()
+    app = IdempotencyMiddleware(endpoint, store)
+    asyncio.run(post(app))
+    # As if the worker running the request had died while holding the key
+    with engine.begin() as conn:
+        conn.execute(
+            IdempotencyKey.__table__.update().values(
+                status=None, body=None, headers=None, expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+            )
+        )
+
+    retry = asyncio.run(post(app))
+
+    assert (retry.status_code, retry.json()) == (201, {"call": 2})
+
+
+def test_requests_without_a_key_are_not_stored(store):
+    endpoint = make_endpoint()
+    app = IdempotencyMiddleware(endpoint, store)
+
+    asyncio.run(post(app, key=None))
+    asyncio.run(post(app, key=None))
+
+    assert len(endpoint.calls) == 2
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
+
+
+def test_purge_deletes_expired_keys_only(store):
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(IdempotencyKey), [
+            {"key": "expired", "fingerprint": "f", "owner": "o", "expires_at": now - timedelta(seconds=1)},
+            {"key": "live", "fingerprint": "f", "owner": "o", "expires_at": now + timedelta(hours=1)},
+        ])
+
+    assert store.purge() == 1
+    with engine.connect() as conn:
+        assert conn.scalars(select(IdempotencyKey.key)).all() == ["live"]
@@ -0,0 +1,99 @@
+import pytest
+
+from app.core.online_migrations import classify_statement, lock_report, split_statements
+
+
+@pytest.mark.parametrize("statement, level", [
+    ("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_country ON users (country)", "ok"),
+    ("CREATE INDEX ix_users_country ON users (country)", "HEAVY"),
+    ("CREATE UNIQUE INDEX ix_users_email ON users (email)", "HEAVY"),
+    ("DROP INDEX ix_users_country", "brief"),
+    ("DROP TABLE users", "HEAVY"),
+    ("ALTER TABLE users ADD COLUMN country VARCHAR", "brief"),
+    ("ALTER TABLE users ADD COLUMN country VARCHAR DEFAULT 'CI' NOT NULL", "brief"),
+    ("ALTER TABLE users ADD COLUMN created TIMESTAMP DEFAULT now() NOT NULL", "HEAVY"),
+    ("ALTER TABLE trips ADD CONSTRAINT fk_driver FOREIGN KEY (driver_id) REFERENCES users (id)", "HEAVY"),
+    ("ALTER TABLE trips ADD CONSTRAINT fk_driver FOREIGN KEY (driver_id) REFERENCES users (id) NOT VALID", "brief"),
+    ("ALTER TABLE trips VALIDATE CONSTRAINT fk_driver", "ok"),
+    ("ALTER TABLE users ADD CONSTRAINT uq_email UNIQUE (email)", "HEAVY"),
+    ("ALTER TABLE users ADD CONSTRAINT uq_email UNIQUE USING INDEX ix_users_email", "brief"),
+    ("ALTER TABLE users ALTER COLUMN phone TYPE TEXT", "HEAVY"),
+    ("ALTER TABLE users ALTER COLUMN phone SET NOT NULL", "HEAVY"),
+    ("UPDATE users SET country = 'CI'", "HEAVY"),
+    ("UPDATE users SET country = 'CI' WHERE id = 1", "ok"),
+    ("-- backfill users in batches of 1000: UPDATE users SET country = 'CI' WHERE country IS NULL", "ok"),
+])
+def test_classify_statement(statement, level):
+    assert classify_statement(statement).level == level
+
+
+@pytest.mark.parametrize("statement", [
+    "SET lock_timeout = '3s'",
+    "CREATE TABLE audit_events (id BIGSERIAL PRIMARY KEY)",
+    "INSERT INTO alembic_version (version_num) VALUES ('008')",
+])
+def test_statements_without_table_locks_are_not_reported(statement):
+    assert classify_statement(statement) is None
+
+
+def test_split_statements_keeps_backfill_markers_only():
+    script = """
+-- Running upgrade 007 -> 008
+
+ALTER TABLE users
+    ADD COLUMN country VARCHAR;
+
+-- backfill users in batches of 1000: UPDATE users SET country = 'CI' WHERE country IS NULL
+UPDATE alembic_version SET version_num='008' WHERE alembic_version.version_num = '007';
+"""
+    assert list(split_statements(script)) == [
+        "ALTER TABLE users\n    ADD COLUMN country VARCHAR",
+        "-- backfill users in batches of 1000: UPDATE users SET country = 'CI' WHERE country IS NULL",
+        "UPDATE alembic_version SET version_num='008' WHERE alembic_version.version_num = '007'",
+    ]
+
+
+def test_set_not_null_after_validated_check_is_brief():
+    script = """
+ALTER TABLE users ADD CONSTRAINT users_country_not_null CHECK (country IS NOT NULL) NOT VALID;
+ALTER TABLE users VALIDATE CONSTRAINT users_country_not_null;
+ALTER TABLE users ALTER COLUMN country SET NOT NULL;
+ALTER TABLE users DROP CONSTRAINT users_country_not_null;
+"""
+    assert [f.level for f in lock_report(script)] == ["brief", "ok", "brief", "brief"]
+
+
+def test_set_not_null_needs_the_check_on_the_same_column():
+    script = """
+ALTER TABLE users ADD CONSTRAINT users_email_not_null CHECK (email IS NOT NULL) NOT VALID;
+ALTER TABLE users VALIDATE CONSTRAINT users_email_not_null;
+ALTER TABLE users ALTER COLUMN country SET NOT NULL;
+"""
+    assert lock_report(script)[-1].level == "HEAVY"
+
+
+def test_unvalidated_check_does_not_make_set_not_null_brief():
+    script = """
+ALTER TABLE users ADD CONSTRAINT users_country_not_null CHECK (country IS NOT NULL) NOT VALID;
+ALTER TABLE users ALTER COLUMN country SET NOT NULL;
+"""
+    assert lock_report(script)[-1].level == "HEAVY"
+
+
+def test_tables_created_in_the_same_run_are_ok():
+    script = """
+CREATE TABLE idempotency_keys (key VARCHAR(64) NOT NULL, expires_at TIMESTAMP WITH TIME ZONE NOT NULL);
+CREATE INDEX ix_idempotency_keys_expires_at ON idempotency_keys (expires_at);
+ALTER TABLE idempotency_keys ALTER COLUMN key SET NOT NULL;
+CREATE INDEX ix_users_country ON users (country);
+"""
+    findings = lock_report(script)
+
+    assert [f.level for f in findings] == ["ok", "ok", "HEAVY"]
+    assert findings[0].reason == "table created earlier in this run, still empty"
+
+
+def test_destructive_statements_stay_heavy_on_new_tables():
+    findings = lock_report("CREATE TABLE scratch (id INT);\nDROP TABLE scratch;")
+
+    assert [f.level for f in findings] == ["HEAVY"]
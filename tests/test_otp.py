@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import otp
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.otp import OtpResult, send_otp, verify_otp
+from app.core.sms import StubSmsSender
+from app.models.otp import PhoneOtpLimit
+
+PHONE = "+22507000001"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Unix time seen by app.core.otp; advance it with clock.now += seconds."""
+    clock = SimpleNamespace(now=1_800_000_000.0)
+    monkeypatch.setattr(otp, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def db(create_tables):
+    create_tables(PhoneOtpLimit)
+    otp._blocked.clear()
+    session = SessionLocal()
+    yield session
+    session.close()
+    otp._blocked.clear()
+
+
+def other_worker():
+    """Forget what this process cached, as a request served by another worker would."""
+    otp._blocked.clear()
+
+
+def code_at(now: float) -> str:
+    return otp._code_for(PHONE, otp._window(now))
+
+
+def wrong_code(now: float) -> str:
+    return str((int(code_at(now)) + 1) % 10 ** settings.OTP_LENGTH).zfill(settings.OTP_LENGTH)
+
+
+def test_sends_a_code_once_per_cooldown_across_workers(db, clock):
+    sms = StubSmsSender()
+
+    assert send_otp(db, PHONE, sms) == 0
+    other_worker()
+    clock.now += 10
+    assert send_otp(db, PHONE, sms) == settings.OTP_RESEND_SECONDS - 10
+    assert len(sms.outbox) == 1
+    assert code_at(clock.now) in sms.outbox[0][1]
+
+    clock.now += settings.OTP_RESEND_SECONDS
+    other_worker()
+    assert send_otp(db, PHONE, sms) == 0
+    assert len(sms.outbox) == 2
+
+
+def test_cooldown_is_answered_from_memory_once_seen(db, clock):
+    sms = StubSmsSender()
+    send_otp(db, PHONE, sms)
+    db.query(PhoneOtpLimit).delete()
+    db.commit()
+
+    assert send_otp(db, PHONE, sms) > 0  # No row left, but this worker knows the phone is cooling down
+
+
+def test_correct_code_verifies_and_clears_the_limits(db, clock):
+    send_otp(db, PHONE, StubSmsSender())
+
+    assert verify_otp(db, PHONE, code_at(clock.now)) == OtpResult.VERIFIED
+    assert db.get(PhoneOtpLimit, PHONE) is None
+
+
+def test_code_of_the_previous_window_is_accepted(db, clock):
+    code = code_at(clock.now)
+    clock.now += settings.OTP_TTL_SECONDS
+
+    assert verify_otp(db, PHONE, code) == OtpResult.VERIFIED
+
+
+def test_expired_code_is_rejected(db, clock):
+    code = code_at(clock.now)
+    clock.now += 2 * settings.OTP_TTL_SECONDS
+
+    assert verify_otp(db, PHONE, code) == OtpResult.INVALID
+
+
+def test_attempts_are_limited_across_workers(db, clock):
+    results = []
+    for _ in range(settings.OTP_MAX_ATTEMPTS):
+        other_worker()
+        results.append(verify_otp(db, PHONE, wrong_code(clock.now)))
+
+    assert results == [OtpResult.INVALID] * (settings.OTP_MAX_ATTEMPTS - 1) + [OtpResult.LOCKED]
+    other_worker()
+    assert verify_otp(db, PHONE, code_at(clock.now)) == OtpResult.LOCKED
+
+
+def test_new_codes_do_not_reset_the_attempt_limit(db, clock):
+    sms = StubSmsSender()
+    for _ in range(settings.OTP_MAX_ATTEMPTS):
+        verify_otp(db, PHONE, wrong_code(clock.now))
+    clock.now += 2 * settings.OTP_TTL_SECONDS  # Earlier codes expired; a new one is sent
+    other_worker()
+    assert send_otp(db, PHONE, sms) == 0
+
+    assert verify_otp(db, PHONE, code_at(clock.now)) == OtpResult.LOCKED
+
+
+def test_attempts_are_allowed_again_in_the_next_window(db, clock):
+    for _ in range(settings.OTP_MAX_ATTEMPTS):
+        verify_otp(db, PHONE, wrong_code(clock.now))
+    clock.now += settings.OTP_ATTEMPT_WINDOW_SECONDS
+    other_worker()
+
+    assert verify_otp(db, PHONE, code_at(clock.now)) == OtpResult.VERIFIED
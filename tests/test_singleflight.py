@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core import metrics
+from app.core.singleflight import SingleFlight
+
+
+def counter(name):
+    return metrics.snapshot().get(name, 0)
+
+
+def run_concurrently(flight, key, fn, callers):
+    """Start callers threads on flight.do(key, fn); returns them once all have joined the call."""
+    pool = ThreadPoolExecutor(max_workers=callers)
+    joined = counter(f"singleflight.{flight.name}.calls") + callers
+    futures = [pool.submit(flight.do, key, fn) for _ in range(callers)]
+    while counter(f"singleflight.{flight.name}.calls") < joined:
+        threading.Event().wait(0.01)
+    return pool, futures
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test_shared")
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return "row"
+
+    pool, futures = run_concurrently(flight, "key", load, callers=4)
+    while counter("singleflight.test_shared.coalesced") < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    results = [future.result(5) for future in futures]
+    pool.shutdown()
+
+    assert len(calls) == 1
+    assert sorted(results) == [("row", False)] + [("row", True)] * 3
+
+
+def test_exception_reaches_every_waiting_caller():
+    flight = SingleFlight("test_error")
+    release = threading.Event()
+
+    def load():
+        release.wait(5)
+        raise LookupError("db down")
+
+    pool, futures = run_concurrently(flight, "key", load, callers=3)
+    release.set()
+    for future in futures:
+        with pytest.raises(LookupError, match="db down"):
+            future.result(5)
+    pool.shutdown()
+
+
+def test_nothing_is_cached_after_the_call():
+    flight = SingleFlight("test_uncached")
+    results = iter(["first", "second"])
+
+    assert flight.do("key", lambda: next(results)) == ("first", False)
+    assert flight.do("key", lambda: next(results)) == ("second", False)
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight("test_keys")
+    release = threading.Event()
+
+    pool, futures = run_concurrently(flight, "slow", lambda: release.wait(5), callers=1)
+    assert flight.do("fast", lambda: "done") == ("done", False)
+    release.set()
+    futures[0].result(5)
+    pool.shutdown()
+
+
+@pytest.mark.parametrize("lookup, value, column", [
+    ("get_user_record_by_phone", "+22507000001", "phone"),
+    ("get_user_record_by_email", "a@example.com", "email"),
+])
+def test_user_record_lookups_are_coalesced_per_column(monkeypatch, lookup, value, column):
+    from app.crud import user as crud_user
+
+    keys = []
+    monkeypatch.setattr(crud_user._user_record_lookups, "do", lambda key, fn: (keys.append(key), (None, False))[1])
+
+    assert getattr(crud_user, lookup)(db=None, **{column: value}) is None
+    assert keys[0][:2] == (column, value)